@@ -4,7 +4,6 @@ from __future__ import annotations
 
 import argparse
 import json
-import os
 import sys
 from dataclasses import dataclass
 from pathlib import Path
@@ -43,12 +42,12 @@ def get_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Migrate Firestore data to PostgreSQL")
     parser.add_argument(
         "--firebase-credentials",
-        default=os.getenv("FIREBASE_CREDENTIALS_PATH", str(ROOT / "firebase_credentials.json")),
+        default=config.ENV.get("FIREBASE_CREDENTIALS_PATH", str(ROOT / "firebase_credentials.json")),
         help="Path to the Firebase service account JSON",
     )
     parser.add_argument(
         "--database-url",
-        default=os.getenv("DATABASE_URL", getattr(config, "DATABASE_URL", "")),
+        default=config.ENV.get("DATABASE_URL", getattr(config, "DATABASE_URL", "")),
         help="PostgreSQL connection URL",
     )
     parser.add_argument(
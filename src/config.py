@@ -3,18 +3,20 @@ Configuration settings for the LLM Mafia Game Competition.
 """
 
 import os
-from dotenv import load_dotenv
+from collections import ChainMap
+from dotenv import dotenv_values
 
-# Load environment variables from .env file
-load_dotenv()
+# Environment lookup: process environment first, then values parsed once from .env.
+# Set LLM_MAFIA_SKIP_DOTENV to skip reading .env entirely (e.g. in test runs).
+ENV = ChainMap(os.environ, {} if os.environ.get("LLM_MAFIA_SKIP_DOTENV") else dotenv_values())
 
 # OpenRouter API settings
-OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "your_openrouter_api_key_here")
+OPENROUTER_API_KEY = ENV.get("OPENROUTER_API_KEY", "your_openrouter_api_key_here")
 OPENROUTER_API_URL = "https://openrouter.ai/api/v1/chat/completions"
 
 # Ollama API settings
-OLLAMA_API_URL = os.getenv("OLLAMA_API_URL", "http://localhost:11434/api/generate")
-OLLAMA_MODELS = [
+OLLAMA_API_URL = ENV.get("OLLAMA_API_URL", "http://localhost:11434/api/generate")
+OLLAMA_MODELS = (
     "llama3.2:latest",
     "llama3.1:latest",
     "llama3:latest",
@@ -23,19 +25,23 @@ OLLAMA_MODELS = [
     "gemma2:latest",
     "qwen2.5:latest",
     "phi3:latest",
-]
+)
 
 # Database settings (Neon PostgreSQL-compatible)
-DATABASE_URL = os.getenv("DATABASE_URL", "")
-MIN_GAMES_FOR_TOP_DISPLAY = int(os.getenv("MIN_GAMES_FOR_TOP_DISPLAY", 5))
+DATABASE_URL = ENV.get("DATABASE_URL", "")
+DATABASE_POOL_SIZE = int(ENV.get("DATABASE_POOL_SIZE", 10))
+MIN_GAMES_FOR_TOP_DISPLAY = int(ENV.get("MIN_GAMES_FOR_TOP_DISPLAY", 5))
 
 # Game settings
 
 CRITIC_MODEL = "anthropic/claude-sonnet-4.6"
+# Ask the critic model to review each finished game. Turn off for large
+# evaluation sweeps, where the review is one more model call per game.
+GENERATE_CRITIC_REVIEW = ENV.get("GENERATE_CRITIC_REVIEW", "true").lower() == "true"
 # Backward-compatible alias used by older code paths.
 CLAUDE_SONNET_4 = CRITIC_MODEL
 
-LATEST_FRONTIER_MODELS = [
+LATEST_FRONTIER_MODELS = (
     "openai/gpt-5.4",
     "google/gemini-3.1-pro-preview",
     "anthropic/claude-sonnet-4.6",
@@ -44,9 +50,9 @@ LATEST_FRONTIER_MODELS = [
     "qwen/qwen3-max",
     "moonshotai/kimi-k2.5",
     "meta-llama/llama-4-maverick",
-]
+)
 
-BUDGET_MODELS = [
+BUDGET_MODELS = (
     "openai/gpt-4.1-mini",
     "google/gemini-3.1-flash-lite-preview",
     "anthropic/claude-3.7-sonnet",
@@ -55,9 +61,9 @@ BUDGET_MODELS = [
     "qwen/qwen3-coder",
     "mistralai/mistral-small-3.2-24b-instruct",
     "meta-llama/llama-3.3-70b-instruct",
-]
+)
 
-MODELS = [
+MODELS = (
     # OpenAI
     "openai/gpt-5.4",
     "openai/gpt-5",
@@ -91,9 +97,9 @@ MODELS = [
     "mistralai/mistral-small-3.2-24b-instruct",
     "moonshotai/kimi-k2.5",
     "moonshotai/kimi-k2",
-]
+)
 
-FREE_MODELS = [
+FREE_MODELS = (
     "openai/gpt-oss-120b:free",
     "openai/gpt-oss-20b:free",
     "qwen/qwen3-coder:free",
@@ -106,33 +112,99 @@ FREE_MODELS = [
     "google/gemma-3-4b-it:free",
     "nousresearch/hermes-3-llama-3.1-405b:free",
     "cognitivecomputations/dolphin-mistral-24b-venice-edition:free",
-]
+)
 
 # Game configuration
-NUM_GAMES = int(os.getenv("NUM_GAMES", 1))  # Number of games to simulate
+NUM_GAMES = int(ENV.get("NUM_GAMES", 1))  # Number of games to simulate
 PLAYERS_PER_GAME = int(
-    os.getenv("PLAYERS_PER_GAME", 8)
+    ENV.get("PLAYERS_PER_GAME", 8)
 )  # Number of players in each game
-MAFIA_COUNT = int(os.getenv("MAFIA_COUNT", 2))  # Number of Mafia players
-DOCTOR_COUNT = int(os.getenv("DOCTOR_COUNT", 1))  # Number of Doctor players
-# Villagers will be: PLAYERS_PER_GAME - MAFIA_COUNT - DOCTOR_COUNT
+MAFIA_COUNT = int(ENV.get("MAFIA_COUNT", 2))  # Number of Mafia players
+DOCTOR_COUNT = int(ENV.get("DOCTOR_COUNT", 1))  # Number of Doctor players
+VILLAGER_COUNT = PLAYERS_PER_GAME - MAFIA_COUNT - DOCTOR_COUNT
+
+
+def validate_role_counts():
+    """Raise ValueError unless the role counts make a playable game.
+
+    Checked when a game or simulation starts rather than at import, so a bad
+    setting does not stop the dashboard or anything else importing config.
+    """
+    if MAFIA_COUNT < 1 or DOCTOR_COUNT < 0 or VILLAGER_COUNT < 1:
+        raise ValueError(
+            f"Invalid role counts: {PLAYERS_PER_GAME} players with {MAFIA_COUNT} Mafia "
+            f"and {DOCTOR_COUNT} Doctor(s) leaves {VILLAGER_COUNT} Villager(s)"
+        )
+
+
+# Roles dealt out in every game, shuffled per game
+ROLE_ASSIGNMENT = (
+    ("Mafia",) * MAFIA_COUNT + ("Doctor",) * DOCTOR_COUNT + ("Villager",) * VILLAGER_COUNT
+)
 
 # Game type
 GAME_TYPE = "Classic Mafia"  # Type of Mafia game to run
 
 # Language setting
-LANGUAGE = os.getenv(
+LANGUAGE = ENV.get(
     "GAME_LANGUAGE", "English"
 )  # Language for game prompts and interactions (supported: English, Spanish, French, Korean)
 
+# Worker threads for parallel simulations, which also bounds the pool of
+# reusable games. Games mostly wait on LLM APIs, but every worker adds
+# concurrent API calls, so the default stays conservative (the same as
+# ThreadPoolExecutor's); raise it explicitly when rate limits allow.
+MAX_WORKERS = int(ENV.get("MAX_WORKERS", min(32, (os.cpu_count() or 4) + 4)))
+# Start parallel simulations at the CPU count and grow towards MAX_WORKERS
+# while game latency holds steady, backing off when it degrades.
+ADAPTIVE_WORKERS = ENV.get("ADAPTIVE_WORKERS", "false").lower() == "true"
+
+# Ask every player in a day discussion or voting round at once. Players then
+# answer the discussion as it stood at the start of the round instead of
+# hearing earlier speakers, which changes game dynamics, so this is opt-in.
+PARALLEL_DAY_DISCUSSION = ENV.get("PARALLEL_DAY_DISCUSSION", "false").lower() == "true"
+
+# Collect confirmation votes with one call per model, each answering for all
+# of its voters, instead of one call per voter. Those voters then no longer
+# reason independently, so this is opt-in. English games only.
+BATCH_CONFIRMATION = ENV.get("BATCH_CONFIRMATION", "false").lower() == "true"
+
 # Maximum number of rounds before declaring a draw
-MAX_ROUNDS = int(os.getenv("MAX_ROUNDS", 20))
+MAX_ROUNDS = int(ENV.get("MAX_ROUNDS", 20))
 
 # Timeout for API calls (in seconds)
-API_TIMEOUT = int(os.getenv("API_TIMEOUT", 60))
+API_TIMEOUT = int(ENV.get("API_TIMEOUT", 60))
+
+# Total attempts per LLM request, including the first; a model can override
+# it with "max_retries" in MODEL_CONFIGS
+API_MAX_ATTEMPTS = int(ENV.get("API_MAX_ATTEMPTS", 3))
 
 # Maximum output tokens for LLM responses
-MAX_OUTPUT_TOKENS = int(os.getenv("MAX_OUTPUT_TOKENS", 400))
+MAX_OUTPUT_TOKENS = int(ENV.get("MAX_OUTPUT_TOKENS", 400))
+
+# Stream night actions and day votes from OpenRouter and stop generating
+# once the ACTION:/VOTE: line is complete. Anything the model would have
+# written after its decision is dropped from the transcript, so this is opt-in.
+STOP_AT_DECISION = ENV.get("STOP_AT_DECISION", "false").lower() == "true"
+
+# Reuse responses for identical (model, prompt) pairs. Off by default because
+# repeated prompts should normally get fresh, stochastic answers.
+CACHE_LLM_RESPONSES = ENV.get("CACHE_LLM_RESPONSES", "false").lower() == "true"
+LLM_RESPONSE_CACHE_SIZE = int(ENV.get("LLM_RESPONSE_CACHE_SIZE", 4096))
+
+# SQLite file that keeps responses for identical requests across runs, for
+# replays and fixed-seed sweeps. Empty disables it. Entries older than
+# RESPONSE_STORE_TTL seconds are ignored (0 keeps them forever).
+RESPONSE_STORE_PATH = ENV.get("RESPONSE_STORE_PATH", "")
+RESPONSE_STORE_TTL = float(ENV.get("RESPONSE_STORE_TTL", 7 * 24 * 3600))
+
+# Reuse a voter's answer to a near-identical confirmation vote prompt within
+# the same game, where a fresh answer adds nothing. Needs the optional
+# semantic-cache dependencies.
+SEMANTIC_CACHE = ENV.get("SEMANTIC_CACHE", "false").lower() == "true"
+SEMANTIC_CACHE_MODEL = ENV.get("SEMANTIC_CACHE_MODEL", "all-MiniLM-L6-v2")
+SEMANTIC_CACHE_THRESHOLD = float(ENV.get("SEMANTIC_CACHE_THRESHOLD", 0.95))
+SEMANTIC_CACHE_SIZE = int(ENV.get("SEMANTIC_CACHE_SIZE", 256))
 
 # Model-specific configurations
 MODEL_CONFIGS = {
@@ -150,9 +222,20 @@ MODEL_CONFIGS = {
     },
 }
 
+# Per-model request timeout resolved once; models without an override use API_TIMEOUT
+EFFECTIVE_TIMEOUT = {
+    model: model_config.get("timeout", API_TIMEOUT)
+    for model, model_config in MODEL_CONFIGS.items()
+}
+
 # Random seed for reproducibility (set to None for random behavior)
-RANDOM_SEED = os.getenv("RANDOM_SEED")
+RANDOM_SEED = ENV.get("RANDOM_SEED")
 if RANDOM_SEED is not None:
     RANDOM_SEED = int(RANDOM_SEED)
 
-UNIQUE_MODELS = os.getenv("UNIQUE_MODELS", "true") == "true"
+UNIQUE_MODELS = ENV.get("UNIQUE_MODELS", "true") == "true"
+
+# Console log level (DEBUG, INFO, WARNING, ERROR). At WARNING and above the
+# per-game progress lines stay off the console; game log files keep them.
+LOG_LEVEL = ENV.get("LOG_LEVEL", "INFO").upper()
+
@@ -3,25 +3,22 @@ Dashboard for the LLM Mafia Game Competition.
 """
 
 import io
-import base64
-import json
 import os
+import json
 import secrets
 import time
 import datetime
 import copy
+import hashlib
 import threading
 import traceback
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from functools import wraps
 from hmac import compare_digest
 from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass
-import matplotlib
-
-matplotlib.use("Agg")  # Use Agg backend for non-interactive mode
-import matplotlib.pyplot as plt
-import numpy as np
+import orjson
 from flask import (
     Flask,
     render_template,
@@ -33,24 +30,63 @@ from flask import (
     session,
     url_for,
 )
+from flask.json.provider import DefaultJSONProvider
+from werkzeug.local import LocalProxy
 import config
 from firebase_manager import FirebaseManager
 from flask_caching import Cache
+from flask_compress import Compress
 from openrouter import get_openrouter_account_state
 from simulate import run_simulation
 
 CONFIGURED_SESSION_SECRET = (
-    os.getenv("ADMIN_SESSION_SECRET")
-    or os.getenv("FLASK_SECRET_KEY")
-    or os.getenv("SECRET_KEY")
+    config.ENV.get("ADMIN_SESSION_SECRET")
+    or config.ENV.get("FLASK_SECRET_KEY")
+    or config.ENV.get("SECRET_KEY")
 )
 
+
+class OrjsonProvider(DefaultJSONProvider):
+    """JSON provider that encodes API responses with orjson."""
+
+    def _dumpb(self, obj, sort_keys=None):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys if sort_keys is None else sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, default=self.default, option=option)
+
+    def dumps(self, obj, **kwargs):
+        return self._dumpb(obj, kwargs.get("sort_keys")).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(self._dumpb(obj), mimetype=self.mimetype)
+
+
 app = Flask(__name__, static_folder="static", template_folder="templates")
+app.json = OrjsonProvider(app)
 app.secret_key = CONFIGURED_SESSION_SECRET or secrets.token_hex(32)
 app.config["SESSION_COOKIE_HTTPONLY"] = True
 app.config["SESSION_COOKIE_SAMESITE"] = "Lax"
-app.config["SESSION_COOKIE_SECURE"] = bool(os.getenv("RAILWAY_ENVIRONMENT"))
-firebase = FirebaseManager()
+app.config["SESSION_COOKIE_SECURE"] = bool(config.ENV.get("RAILWAY_ENVIRONMENT"))
+firebase_lock = threading.Lock()
+firebase_instance = None
+
+
+def _get_firebase():
+    """Create the database manager on first use instead of at import time."""
+    global firebase_instance
+    if firebase_instance is None:
+        with firebase_lock:
+            if firebase_instance is None:
+                firebase_instance = FirebaseManager()
+    return firebase_instance
+
+
+firebase = LocalProxy(_get_firebase)
 
 # Configure Flask-Caching
 cache_config = {
@@ -59,7 +95,63 @@ cache_config = {
 }
 cache = Cache(app, config=cache_config)
 
-ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "")
+# gzip/brotli-compress JSON and HTML responses. Game lists repeat the same
+# model names over and over, so a light level already shrinks them several
+# fold at a fraction of the default level's CPU; tiny bodies are left as is.
+app.config["COMPRESS_MIMETYPES"] = [
+    "application/json",
+    "text/html",
+    "text/css",
+    "application/javascript",
+]
+app.config["COMPRESS_LEVEL"] = 4
+app.config["COMPRESS_BR_LEVEL"] = 4
+app.config["COMPRESS_MIN_SIZE"] = 500
+Compress(app)
+
+
+@app.after_request
+def _answer_not_modified(response):
+    """Replace a 200 whose ETag the client already holds with an empty 304.
+
+    Registered after Flask-Compress, so it runs before it. Compressed bodies
+    have ":<encoding>" appended to their ETag, so the client's tags are
+    compared without that suffix. Running here, after the response cache,
+    also covers responses served from the cache.
+    """
+    etag, _ = response.get_etag()
+    if response.status_code != 200 or not etag or not request.if_none_match:
+        return response
+    client_tags = {tag.split(":", 1)[0] for tag in request.if_none_match.as_set()}
+    if etag not in client_tags:
+        return response
+    not_modified = app.response_class(status=304)
+    not_modified.set_etag(etag)
+    if "Cache-Control" in response.headers:
+        not_modified.headers["Cache-Control"] = response.headers["Cache-Control"]
+    return not_modified
+
+# Static files are linked without a version, so browsers revalidate them
+# daily to pick up deploys. Chart images are requested as ?v=<hash> with a
+# hash of the image bytes (see _chart_version), so a given URL never changes
+# and those are cached for good.
+STATIC_MAX_AGE = 24 * 3600
+VERSIONED_STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+app.config["SEND_FILE_MAX_AGE_DEFAULT"] = STATIC_MAX_AGE
+
+
+@app.after_request
+def _cache_versioned_static(response):
+    """Mark versioned chart images as immutable."""
+    if (
+        response.status_code == 200
+        and request.path.startswith("/static/charts/")
+        and "v" in request.args
+    ):
+        response.headers["Cache-Control"] = VERSIONED_STATIC_CACHE_CONTROL
+    return response
+
+ADMIN_PASSWORD = config.ENV.get("ADMIN_PASSWORD", "")
 DEFAULT_ADMIN_MODELS = config.LATEST_FRONTIER_MODELS
 ADMIN_MODEL_PRESETS = {
     "latest_frontier": DEFAULT_ADMIN_MODELS,
@@ -68,6 +160,28 @@ ADMIN_MODEL_PRESETS = {
 }
 SIMULATION_LOG_LIMIT = 200
 simulation_state_lock = threading.Lock()
+MODEL_STATS_CACHE_KEY = "model_stats"
+MODEL_STATS_CACHE_TIMEOUT = 30
+DASHBOARD_RECENT_GAMES = 15
+model_stats_refresh_lock = threading.Lock()
+# Runs the bootstrap endpoint's database reads side by side; shared so a
+# page load does not start and tear down threads of its own
+bootstrap_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bootstrap")
+CHART_REFRESH_INTERVAL = int(config.ENV.get("CHART_REFRESH_INTERVAL", 60))
+chart_cache_lock = threading.Lock()
+chart_render_lock = threading.Lock()
+chart_refresh_event = threading.Event()
+chart_cache = {"win_rates": None, "games_played": None}
+chart_refresher = None
+chart_figure = None
+PNG_COMPRESS_LEVEL = 1
+CHART_DPI = 90
+# Chart images are also kept as WebP, served to browsers that accept it
+WEBP_QUALITY = 85
+CHART_IMAGE_TYPES = ("image/png", "image/webp")
+CHART_STATIC_DIR = os.path.join(app.static_folder, "charts")
+# Content hash of each published chart file, used as its cache-busting version
+chart_file_versions = {}
 simulation_state = {
     "job_id": None,
     "running": False,
@@ -239,9 +353,18 @@ def _append_simulation_event(message, level="info"):
         simulation_state["events"] = simulation_state["events"][-SIMULATION_LOG_LIMIT:]
 
 
+def _is_cacheable_response(response):
+    """Only cache successful responses so transient errors are not pinned."""
+    return getattr(response, "status_code", 200) == 200
+
+
 def _clear_dashboard_caches():
     """Clear cached dashboard payloads after new games are stored."""
     cache.clear()
+    with chart_cache_lock:
+        for chart_name in chart_cache:
+            chart_cache[chart_name] = None
+    chart_refresh_event.set()
 
 
 def _validate_admin_models(models):
@@ -450,6 +573,7 @@ def admin_logout():
 
 
 @app.route("/api/stats")
+@cache.cached(timeout=30, query_string=True, response_filter=_is_cacheable_response)
 def get_stats():
     """Get statistics from the database."""
     stats = get_cached_model_stats()
@@ -457,7 +581,9 @@ def get_stats():
     # Set cache control headers for better performance
     response = make_response(jsonify(stats))
     response.headers["Content-Type"] = "application/json"
-    response.headers["Cache-Control"] = "max-age=60"  # Cache for 60 seconds
+    # Cache for 60 seconds, then revalidate; unchanged stats cost a 304
+    response.add_etag()
+    response.headers["Cache-Control"] = "max-age=60, must-revalidate"
 
     return response
 
@@ -476,10 +602,22 @@ def get_model(model_name):
     return response
 
 
-@cache.cached(timeout=30, key_prefix="model_stats")
 def get_cached_model_stats():
-    """Get cached model statistics from the database."""
-    return firebase.get_model_stats()
+    """Get cached model statistics from the database.
+
+    The dashboard fires its stats and chart requests in parallel, so a cold
+    cache is refilled under a lock to make them share a single database read.
+    """
+    stats = cache.get(MODEL_STATS_CACHE_KEY)
+    if stats is not None:
+        return stats
+
+    with model_stats_refresh_lock:
+        stats = cache.get(MODEL_STATS_CACHE_KEY)
+        if stats is None:
+            stats = firebase.get_model_stats()
+            cache.set(MODEL_STATS_CACHE_KEY, stats, timeout=MODEL_STATS_CACHE_TIMEOUT)
+    return stats
 
 
 @cache.memoize(timeout=60)
@@ -578,6 +716,7 @@ def start_admin_simulation():
 
 
 @app.route("/api/games")
+@cache.cached(timeout=30, query_string=True, response_filter=_is_cacheable_response)
 def get_games():
     """Get game results from the database."""
     try:
@@ -589,16 +728,11 @@ def get_games():
 
         games = get_cached_game_results(limit)
 
-        # Validate timestamp format
-        for game in games:
-            if "timestamp" in game and isinstance(game["timestamp"], int):
-                # Ensure timestamp is in seconds, not milliseconds
-                if game["timestamp"] > 10000000000:  # If in milliseconds
-                    game["timestamp"] = game["timestamp"] // 1000
-
         response = make_response(jsonify(games))
         response.headers["Content-Type"] = "application/json"
-        response.headers["Cache-Control"] = "max-age=10"  # Cache for 10 seconds
+        # Cache for 10 seconds, then revalidate; an unchanged list costs a 304
+        response.add_etag()
+        response.headers["Cache-Control"] = "max-age=10, must-revalidate"
 
         return response
     except Exception as e:
@@ -618,6 +752,42 @@ def get_cached_game_results(limit):
     return firebase.get_game_results(limit=limit)
 
 
+def _in_app_context(func, *args):
+    """Run func inside an app context so worker threads can use the cache."""
+    with app.app_context():
+        return func(*args)
+
+
+@app.route("/api/bootstrap")
+@cache.cached(timeout=30, query_string=True, response_filter=_is_cacheable_response)
+def get_bootstrap():
+    """Get stats, recent games and chart data for the index page in one call."""
+    try:
+        stats_future = bootstrap_executor.submit(_in_app_context, get_cached_model_stats)
+        games_future = bootstrap_executor.submit(
+            _in_app_context, get_cached_game_results, DASHBOARD_RECENT_GAMES
+        )
+        stats = stats_future.result()
+        games = games_future.result()
+
+        charts = {
+            name: builder(stats)[0] for name, builder in CHART_DATA_BUILDERS.items()
+        }
+        payload = {
+            "stats": stats,
+            "games": games,
+            "charts": charts,
+        }
+
+        response = make_response(jsonify(payload))
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Cache-Control"] = "max-age=10"  # Cache for 10 seconds
+
+        return response
+    except Exception as e:
+        return make_response(jsonify({"error": str(e)}), 500)
+
+
 @app.route("/api/game/<game_id>")
 def get_game(game_id):
     """Get game data from the database."""
@@ -647,374 +817,454 @@ def get_cached_game_log(game_id):
     return firebase.get_game_log(game_id)
 
 
-@app.route("/api/chart/win_rates")
-def get_win_rate_chart():
-    """Generate a win rate chart."""
-    try:
-        stats = get_cached_model_stats()
+CHART_SERIES_COLORS = {
+    "Overall": "blue",
+    "Mafia": "red",
+    "Villager": "green",
+    "Doctor": "purple",
+}
 
-        if not stats:
-            return make_response(jsonify({"error": "No data available"}), 404)
 
-        sorted_models = _get_eligible_win_rate_models(stats)
-        if not sorted_models:
-            return make_response(
-                jsonify(
-                    {
-                        "error": f"No models with at least {config.MIN_GAMES_FOR_TOP_DISPLAY} games"
-                    }
-                ),
-                404,
-            )
+WIN_RATE_CHART_SERIES = (
+    ("Overall", "win_rate"),
+    ("Mafia", "mafia_win_rate"),
+    ("Villager", "villager_win_rate"),
+    ("Doctor", "doctor_win_rate"),
+)
 
-        # Extract data for chart
-        models = [model for model, _ in sorted_models]
-        win_rates = [stats[model]["win_rate"] * 100 for model in models]
-        mafia_win_rates = [stats[model]["mafia_win_rate"] * 100 for model in models]
-        villager_win_rates = [
-            stats[model]["villager_win_rate"] * 100 for model in models
-        ]
-        doctor_win_rates = [stats[model]["doctor_win_rate"] * 100 for model in models]
-
-        # Create chart with explicit figure and axes
-        fig, ax = plt.subplots(figsize=(12, 8))
-        fig.set_facecolor("white")  # Set white background
-        ax.set_facecolor("white")  # Set white background for plot area
-
-        # Set width of bars
-        bar_width = 0.2
-
-        # Set position of bars on x axis
-        r1 = np.arange(len(models))
-        r2 = [x + bar_width for x in r1]
-        r3 = [x + bar_width for x in r2]
-        r4 = [x + bar_width for x in r3]
-
-        # Create bars
-        ax.bar(r1, win_rates, width=bar_width, label="Overall", color="blue")
-        ax.bar(r2, mafia_win_rates, width=bar_width, label="Mafia", color="red")
-        ax.bar(r3, villager_win_rates, width=bar_width, label="Villager", color="green")
-        ax.bar(r4, doctor_win_rates, width=bar_width, label="Doctor", color="purple")
-
-        # Add labels and title
-        ax.set_xlabel("Models", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Win Rate (%)", fontsize=12, fontweight="bold")
-        ax.set_title("Win Rates by Model and Role", fontsize=14, fontweight="bold")
-
-        # Ensure axes are visible
-        ax.spines["top"].set_visible(True)
-        ax.spines["right"].set_visible(True)
-        ax.spines["bottom"].set_visible(True)
-        ax.spines["left"].set_visible(True)
-
-        # Set tick parameters to ensure visibility
-        ax.tick_params(axis="both", which="major", labelsize=10, width=1, length=5)
-        ax.tick_params(axis="both", which="minor", width=1, length=3)
-
-        # Set x-ticks
-        ax.set_xticks([r + bar_width * 1.5 for r in range(len(models))])
-        ax.set_xticklabels(
-            [model.split("/")[-1] for model in models], rotation=45, ha="right"
-        )
+GAMES_PLAYED_CHART_SERIES = (
+    ("Mafia", "mafia_games"),
+    ("Villager", "villager_games"),
+    ("Doctor", "doctor_games"),
+)
+
+
+def _build_chart_data(stats, models, series_keys, scale=1):
+    """Assemble chart series by slicing columns out of a single stats matrix."""
+    import numpy as np
 
-        # Add grid for better readability
-        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    stat_keys = [stat_key for _, stat_key in series_keys]
+    values = (
+        np.array([[stats[model][key] for key in stat_keys] for model in models])
+        .reshape(len(models), len(stat_keys))
+        * scale
+    )
+    return {
+        "models": models,
+        "labels": [stats[model]["short_name"] for model in models],
+        "series": [
+            {"label": label, "values": values[:, index].tolist()}
+            for index, (label, _) in enumerate(series_keys)
+        ],
+    }
 
-        # Add legend
-        ax.legend(fontsize=10)
 
-        # Adjust layout
-        plt.tight_layout()
+def _win_rate_chart_data(stats):
+    """Build the win rate chart series.
 
-        # Save chart to memory with optimized settings
-        img = io.BytesIO()
-        plt.savefig(img, format="png", dpi=120, bbox_inches="tight", pad_inches=0.2)
-        img.seek(0)
+    Returns:
+        tuple: (chart_data, error_message) where exactly one is None.
+    """
+    if not stats:
+        return None, "No data available"
 
-        # Encode chart as base64
-        chart_url = base64.b64encode(img.getvalue()).decode()
+    sorted_models = _get_eligible_win_rate_models(stats)
+    if not sorted_models:
+        return None, f"No models with at least {config.MIN_GAMES_FOR_TOP_DISPLAY} games"
 
-        # Close the figure to free memory
-        plt.close(fig)
+    models = [model for model, _ in sorted_models]
+    return _build_chart_data(stats, models, WIN_RATE_CHART_SERIES, scale=100), None
 
-        # Create response with appropriate headers
-        response = make_response(jsonify({"chart_url": chart_url}))
-        response.headers["Content-Type"] = "application/json"
-        response.headers["Cache-Control"] = "max-age=300"  # Cache for 5 minutes
 
-        return response
-    except Exception as e:
-        return make_response(jsonify({"error": str(e)}), 500)
+def _games_played_chart_data(stats):
+    """Build the games played chart series.
 
+    Returns:
+        tuple: (chart_data, error_message) where exactly one is None.
+    """
+    if not stats:
+        return None, "No data available"
 
-@app.route("/api/chart/games_played")
-def get_games_played_chart():
-    """Generate a games played chart."""
-    try:
-        stats = get_cached_model_stats()
+    # Sort models by number of games played
+    sorted_models = sorted(
+        stats.items(), key=lambda x: x[1]["games_played"], reverse=True
+    )
 
-        if not stats:
-            return make_response(jsonify({"error": "No data available"}), 404)
+    models = [model for model, _ in sorted_models]
+    return _build_chart_data(stats, models, GAMES_PLAYED_CHART_SERIES), None
 
-        # Sort models by number of games played
-        sorted_models = sorted(
-            stats.items(), key=lambda x: x[1]["games_played"], reverse=True
-        )
 
-        # Extract data for chart
-        models = [model for model, _ in sorted_models]
-        games_played = [stats[model]["games_played"] for model in models]
-        mafia_games = [stats[model]["mafia_games"] for model in models]
-        villager_games = [stats[model]["villager_games"] for model in models]
-        doctor_games = [stats[model]["doctor_games"] for model in models]
+def _render_win_rate_chart(stats):
+    """Render the win rate chart as PNG bytes.
 
-        # Create chart with explicit figure and axes
-        fig, ax = plt.subplots(figsize=(12, 8))
-        fig.set_facecolor("white")  # Set white background
-        ax.set_facecolor("white")  # Set white background for plot area
+    Returns:
+        tuple: (png_bytes, error_message) where exactly one is None.
+    """
+    import numpy as np
 
-        # Create stacked bars
-        ax.bar(models, mafia_games, label="Mafia", color="red")
+    data, error = _win_rate_chart_data(stats)
+    if error:
+        return None, error
+
+    fig, ax = _get_chart_axes()
+
+    # Set width of bars
+    bar_width = 0.2
+
+    # Offset each role's bars within the model's group
+    positions = np.arange(len(data["models"]))
+    for offset, series in enumerate(data["series"]):
         ax.bar(
-            models, villager_games, bottom=mafia_games, label="Villager", color="green"
+            positions + offset * bar_width,
+            series["values"],
+            width=bar_width,
+            label=series["label"],
+            color=CHART_SERIES_COLORS[series["label"]],
         )
+
+    # Add labels and title
+    ax.set_xlabel("Models", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Win Rate (%)", fontsize=12, fontweight="bold")
+    ax.set_title("Win Rates by Model and Role", fontsize=14, fontweight="bold")
+
+    # Set x-ticks
+    ax.set_xticks(positions + bar_width * 1.5)
+    ax.set_xticklabels(data["labels"], rotation=45, ha="right")
+
+    return _finish_chart(fig, ax), None
+
+
+def _render_games_played_chart(stats):
+    """Render the games played chart as PNG bytes.
+
+    Returns:
+        tuple: (png_bytes, error_message) where exactly one is None.
+    """
+    import numpy as np
+
+    data, error = _games_played_chart_data(stats)
+    if error:
+        return None, error
+
+    fig, ax = _get_chart_axes()
+
+    # Create stacked bars; each role sits on the running total of the roles below it
+    positions = np.arange(len(data["models"]))
+    counts = np.array([series["values"] for series in data["series"]])
+    bottoms = np.cumsum(counts, axis=0) - counts
+    for series, bottom in zip(data["series"], bottoms):
         ax.bar(
-            models,
-            doctor_games,
-            bottom=[mafia_games[i] + villager_games[i] for i in range(len(models))],
-            label="Doctor",
-            color="purple",
+            positions,
+            series["values"],
+            bottom=bottom,
+            label=series["label"],
+            color=CHART_SERIES_COLORS[series["label"]],
         )
 
-        # Add labels and title
-        ax.set_xlabel("Models", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Games Played", fontsize=12, fontweight="bold")
-        ax.set_title("Games Played by Model and Role", fontsize=14, fontweight="bold")
-
-        # Ensure axes are visible
-        ax.spines["top"].set_visible(True)
-        ax.spines["right"].set_visible(True)
-        ax.spines["bottom"].set_visible(True)
-        ax.spines["left"].set_visible(True)
-
-        # Set tick parameters to ensure visibility
-        ax.tick_params(axis="both", which="major", labelsize=10, width=1, length=5)
-        ax.tick_params(axis="both", which="minor", width=1, length=3)
-
-        # Set x-ticks
-        ax.set_xticks([model for model in models])
-        ax.set_xticklabels(
-            [model.split("/")[-1] for model in models], rotation=45, ha="right"
-        )
+    # Add labels and title
+    ax.set_xlabel("Models", fontsize=12, fontweight="bold")
+    ax.set_ylabel("Games Played", fontsize=12, fontweight="bold")
+    ax.set_title("Games Played by Model and Role", fontsize=14, fontweight="bold")
 
-        # Add grid for better readability
-        ax.grid(axis="y", linestyle="--", alpha=0.7)
+    # Set x-ticks
+    ax.set_xticks(positions)
+    ax.set_xticklabels(data["labels"], rotation=45, ha="right")
 
-        # Add legend
-        ax.legend(fontsize=10)
+    return _finish_chart(fig, ax), None
 
-        # Adjust layout
-        plt.tight_layout()
 
-        # Save chart to memory with optimized settings
-        img = io.BytesIO()
-        plt.savefig(img, format="png", dpi=120, bbox_inches="tight", pad_inches=0.2)
-        img.seek(0)
+def _get_chart_axes():
+    """Return the shared chart figure and a freshly cleared axes.
 
-        # Encode chart as base64
-        chart_url = base64.b64encode(img.getvalue()).decode()
+    The figure is created once and reused so each render skips Figure/Axes
+    construction and teardown. Callers must hold ``chart_render_lock``.
+    """
+    global chart_figure
+    if chart_figure is None:
+        # matplotlib is imported on first render so routes that never draw a
+        # chart don't pay its import cost.
+        from matplotlib.figure import Figure
+
+        # Figure is used directly instead of pyplot so the long-lived figure
+        # is never registered with pyplot's global figure manager.
+        chart_figure = Figure(figsize=(12, 8))
+        chart_figure.set_facecolor("white")  # Set white background
+        chart_figure.add_subplot()
+
+    ax = chart_figure.axes[0]
+    ax.clear()
+    ax.set_facecolor("white")  # Set white background for plot area
+    return chart_figure, ax
+
+
+def _finish_chart(fig, ax):
+    """Apply the shared chart styling and rasterize the figure to PNG bytes."""
+    # Ensure axes are visible
+    ax.spines["top"].set_visible(True)
+    ax.spines["right"].set_visible(True)
+    ax.spines["bottom"].set_visible(True)
+    ax.spines["left"].set_visible(True)
+
+    # Set tick parameters to ensure visibility
+    ax.tick_params(axis="both", which="major", labelsize=10, width=1, length=5)
+    ax.tick_params(axis="both", which="minor", width=1, length=3)
+
+    # Add grid for better readability
+    ax.grid(axis="y", linestyle="--", alpha=0.7)
+
+    # Add legend
+    ax.legend(fontsize=10)
+
+    # Adjust layout
+    fig.tight_layout()
+
+    # Save chart to memory with optimized settings. A low zlib level makes
+    # PNG encoding much cheaper; responses are compressed over HTTP anyway.
+    # tight_layout has already fitted the margins, so bbox_inches="tight"
+    # (which costs a second draw pass) is not needed.
+    img = io.BytesIO()
+    fig.savefig(
+        img,
+        format="png",
+        dpi=CHART_DPI,
+        pil_kwargs={"compress_level": PNG_COMPRESS_LEVEL, "optimize": False},
+    )
 
-        # Close the figure to free memory
-        plt.close(fig)
+    return img.getvalue()
 
-        # Create response with appropriate headers
-        response = make_response(jsonify({"chart_url": chart_url}))
-        response.headers["Content-Type"] = "application/json"
-        response.headers["Cache-Control"] = "max-age=300"  # Cache for 5 minutes
 
-        return response
-    except Exception as e:
-        return make_response(jsonify({"error": str(e)}), 500)
+CHART_DATA_BUILDERS = {
+    "win_rates": _win_rate_chart_data,
+    "games_played": _games_played_chart_data,
+}
 
+CHART_RENDERERS = {
+    "win_rates": _render_win_rate_chart,
+    "games_played": _render_games_played_chart,
+}
 
-@app.route("/api/chart/win_rates/image")
-def get_win_rate_image():
-    """Generate a win rate chart and return it directly as an image."""
-    try:
-        stats = get_cached_model_stats()
 
-        if not stats:
-            return make_response("No data available", 404)
+def _encode_webp(png_bytes):
+    """Re-encode a rendered chart as WebP, which is several times smaller."""
+    from PIL import Image
 
-        sorted_models = _get_eligible_win_rate_models(stats)
-        if not sorted_models:
-            return make_response(
-                f"No models with at least {config.MIN_GAMES_FOR_TOP_DISPLAY} games",
-                404,
-            )
+    img = io.BytesIO()
+    with Image.open(io.BytesIO(png_bytes)) as image:
+        image.convert("RGB").save(img, format="WEBP", quality=WEBP_QUALITY, method=4)
+    return img.getvalue()
 
-        # Extract data for chart
-        models = [model for model, _ in sorted_models]
-        win_rates = [stats[model]["win_rate"] * 100 for model in models]
-        mafia_win_rates = [stats[model]["mafia_win_rate"] * 100 for model in models]
-        villager_win_rates = [
-            stats[model]["villager_win_rate"] * 100 for model in models
-        ]
-        doctor_win_rates = [stats[model]["doctor_win_rate"] * 100 for model in models]
-
-        # Create chart with explicit figure and axes
-        fig, ax = plt.subplots(figsize=(12, 8))
-        fig.set_facecolor("white")  # Set white background
-        ax.set_facecolor("white")  # Set white background for plot area
-
-        # Set width of bars
-        bar_width = 0.2
-
-        # Set position of bars on x axis
-        r1 = np.arange(len(models))
-        r2 = [x + bar_width for x in r1]
-        r3 = [x + bar_width for x in r2]
-        r4 = [x + bar_width for x in r3]
-
-        # Create bars
-        ax.bar(r1, win_rates, width=bar_width, label="Overall", color="blue")
-        ax.bar(r2, mafia_win_rates, width=bar_width, label="Mafia", color="red")
-        ax.bar(r3, villager_win_rates, width=bar_width, label="Villager", color="green")
-        ax.bar(r4, doctor_win_rates, width=bar_width, label="Doctor", color="purple")
-
-        # Add labels and title
-        ax.set_xlabel("Models", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Win Rate (%)", fontsize=12, fontweight="bold")
-        ax.set_title("Win Rates by Model and Role", fontsize=14, fontweight="bold")
-
-        # Ensure axes are visible
-        ax.spines["top"].set_visible(True)
-        ax.spines["right"].set_visible(True)
-        ax.spines["bottom"].set_visible(True)
-        ax.spines["left"].set_visible(True)
-
-        # Set tick parameters to ensure visibility
-        ax.tick_params(axis="both", which="major", labelsize=10, width=1, length=5)
-        ax.tick_params(axis="both", which="minor", width=1, length=3)
-
-        # Set x-ticks
-        ax.set_xticks([r + bar_width * 1.5 for r in range(len(models))])
-        ax.set_xticklabels(
-            [model.split("/")[-1] for model in models], rotation=45, ha="right"
-        )
 
-        # Add grid for better readability
-        ax.grid(axis="y", linestyle="--", alpha=0.7)
+def _refresh_chart(chart_name):
+    """Re-render a chart from the current stats and store it in the chart cache.
 
-        # Add legend
-        ax.legend(fontsize=10)
+    Returns:
+        tuple: (images, error_message) where images maps each of
+            CHART_IMAGE_TYPES to encoded bytes, and exactly one is None.
+    """
+    stats = get_cached_model_stats()
+    # All charts draw on one shared figure, so renders from the refresher
+    # thread and request threads must not interleave.
+    with chart_render_lock:
+        png_bytes, error = CHART_RENDERERS[chart_name](stats)
+    images = None
+    if png_bytes is not None:
+        images = {"image/png": png_bytes, "image/webp": _encode_webp(png_bytes)}
+    entry = (images, error)
+    with chart_cache_lock:
+        chart_cache[chart_name] = entry
+    if png_bytes is not None:
+        _publish_chart_file(chart_name, png_bytes)
+    return entry
+
+
+def _chart_file_path(chart_name):
+    """Return the static file path a chart image is published to."""
+    return os.path.join(CHART_STATIC_DIR, f"{chart_name}.png")
+
+
+def _chart_version(png_bytes):
+    """Return the cache-busting version for a chart image's bytes."""
+    return hashlib.blake2b(png_bytes, digest_size=8).hexdigest()
+
+
+def _chart_file_version(chart_name):
+    """Return the version of a published chart file, or None if there is none."""
+    with chart_cache_lock:
+        version = chart_file_versions.get(chart_name)
+    if version is None:
+        # Published by an earlier process; hash it once
+        try:
+            with open(_chart_file_path(chart_name), "rb") as f:
+                version = _chart_version(f.read())
+        except OSError:
+            return None
+        with chart_cache_lock:
+            version = chart_file_versions.setdefault(chart_name, version)
+    return version
+
+
+def _publish_chart_file(chart_name, png_bytes):
+    """Write a rendered chart under static/ so it is served without touching Python.
+
+    Unchanged charts are not rewritten, so their version and any browser
+    copies stay valid.
+    """
+    version = _chart_version(png_bytes)
+    if _chart_file_version(chart_name) == version:
+        return
+    os.makedirs(CHART_STATIC_DIR, exist_ok=True)
+    path = _chart_file_path(chart_name)
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(png_bytes)
+    # Atomic swap so readers never see a partially written image
+    os.replace(tmp_path, path)
+    with chart_cache_lock:
+        chart_file_versions[chart_name] = version
+
+
+def _refresh_all_charts():
+    """Re-render every chart, logging failures instead of raising."""
+    for chart_name in CHART_RENDERERS:
+        try:
+            _refresh_chart(chart_name)
+        except Exception as exc:
+            print(f"Error refreshing {chart_name} chart: {exc}")
+
+
+def _chart_refresh_loop():
+    """Keep the chart cache warm so requests never wait on matplotlib."""
+    with app.app_context():
+        while True:
+            _refresh_all_charts()
+            chart_refresh_event.wait(CHART_REFRESH_INTERVAL)
+            chart_refresh_event.clear()
+
+
+def _ensure_chart_refresher():
+    """Start the background chart refresher on first use."""
+    global chart_refresher
+    with chart_cache_lock:
+        if chart_refresher is not None:
+            return
+        chart_refresher = threading.Thread(target=_chart_refresh_loop, daemon=True)
+        chart_refresher.start()
+
+
+def _get_chart(chart_name):
+    """Return the cached (images, error_message) pair for a chart."""
+    _ensure_chart_refresher()
+    with chart_cache_lock:
+        entry = chart_cache[chart_name]
+    if entry is None:
+        # The refresher has not finished its first pass yet.
+        entry = _refresh_chart(chart_name)
+    return entry
+
+
+def _chart_image_response(chart_name):
+    """Return a cached chart directly as an image, WebP when the client accepts it.
+
+    The PNG bytes are already cached in chart_cache, so the image routes skip
+    the response cache and can answer If-None-Match with 304 Not Modified.
+    """
+    try:
+        images, error = _get_chart(chart_name)
+        if error:
+            return make_response(error, 404)
 
-        # Adjust layout
-        plt.tight_layout()
+        # PNG is listed first, so clients that only send */* still get it
+        mimetype = request.accept_mimetypes.best_match(
+            CHART_IMAGE_TYPES, default="image/png"
+        )
+
+        # Return the cached image bytes as the body, without base64 or a copy
+        response = Response(images[mimetype], mimetype=mimetype)
+        response.vary.add("Accept")
+        # Browsers revalidate after 5 minutes; an unchanged chart then costs
+        # a 304 with an empty body instead of the whole image
+        response.add_etag()
+        response.headers["Cache-Control"] = "max-age=300, must-revalidate"
+
+        return response.make_conditional(request)
+    except Exception as e:
+        return make_response(str(e), 500)
 
-        # Save chart to memory with optimized settings
-        img = io.BytesIO()
-        plt.savefig(img, format="png", dpi=120, bbox_inches="tight", pad_inches=0.2)
-        img.seek(0)
 
-        # Close the figure to free memory
-        plt.close(fig)
+def _chart_data_response(chart_name):
+    """Return chart series as JSON so the browser can draw the chart itself."""
+    try:
+        data, error = CHART_DATA_BUILDERS[chart_name](get_cached_model_stats())
+        if error:
+            return make_response(jsonify({"error": error}), 404)
 
-        # Return the image directly
-        response = make_response(img.getvalue())
-        response.headers["Content-Type"] = "image/png"
-        response.headers["Cache-Control"] = "max-age=300"  # Cache for 5 minutes
+        response = make_response(jsonify(data))
+        response.headers["Content-Type"] = "application/json"
+        response.headers["Cache-Control"] = "max-age=60"  # Cache for 60 seconds
 
         return response
     except Exception as e:
-        return make_response(str(e), 500)
+        return make_response(jsonify({"error": str(e)}), 500)
 
 
-@app.route("/api/chart/games_played/image")
-def get_games_played_image():
-    """Generate a games played chart and return it directly as an image."""
-    try:
-        stats = get_cached_model_stats()
+@app.route("/api/chart_versions")
+def get_chart_versions():
+    """Get the version of each static chart image for cache-busting URLs.
 
-        if not stats:
-            return make_response("No data available", 404)
+    Charts are published to /static/charts/<name>.png by the background
+    refresher; clients load them as /static/charts/<name>.png?v=<version>,
+    where the version is a hash of the image. A version of null means the
+    chart has not been rendered yet.
+    """
+    _ensure_chart_refresher()
+    versions = {
+        chart_name: _chart_file_version(chart_name) for chart_name in CHART_RENDERERS
+    }
 
-        # Sort models by number of games played
-        sorted_models = sorted(
-            stats.items(), key=lambda x: x[1]["games_played"], reverse=True
-        )
+    response = make_response(jsonify(versions))
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Cache-Control"] = "no-cache"
+    return response
 
-        # Extract data for chart
-        models = [model for model, _ in sorted_models]
-        games_played = [stats[model]["games_played"] for model in models]
-        mafia_games = [stats[model]["mafia_games"] for model in models]
-        villager_games = [stats[model]["villager_games"] for model in models]
-        doctor_games = [stats[model]["doctor_games"] for model in models]
 
-        # Create chart with explicit figure and axes
-        fig, ax = plt.subplots(figsize=(12, 8))
-        fig.set_facecolor("white")  # Set white background
-        ax.set_facecolor("white")  # Set white background for plot area
+@app.route("/api/chart/win_rates/data")
+@cache.cached(timeout=30, query_string=True, response_filter=_is_cacheable_response)
+def get_win_rate_chart_data():
+    """Get win rate chart series for client-side rendering."""
+    return _chart_data_response("win_rates")
 
-        # Create stacked bars
-        ax.bar(models, mafia_games, label="Mafia", color="red")
-        ax.bar(
-            models, villager_games, bottom=mafia_games, label="Villager", color="green"
-        )
-        ax.bar(
-            models,
-            doctor_games,
-            bottom=[mafia_games[i] + villager_games[i] for i in range(len(models))],
-            label="Doctor",
-            color="purple",
-        )
 
-        # Add labels and title
-        ax.set_xlabel("Models", fontsize=12, fontweight="bold")
-        ax.set_ylabel("Games Played", fontsize=12, fontweight="bold")
-        ax.set_title("Games Played by Model and Role", fontsize=14, fontweight="bold")
-
-        # Ensure axes are visible
-        ax.spines["top"].set_visible(True)
-        ax.spines["right"].set_visible(True)
-        ax.spines["bottom"].set_visible(True)
-        ax.spines["left"].set_visible(True)
-
-        # Set tick parameters to ensure visibility
-        ax.tick_params(axis="both", which="major", labelsize=10, width=1, length=5)
-        ax.tick_params(axis="both", which="minor", width=1, length=3)
-
-        # Set x-ticks
-        ax.set_xticks([model for model in models])
-        ax.set_xticklabels(
-            [model.split("/")[-1] for model in models], rotation=45, ha="right"
-        )
+@app.route("/api/chart/games_played/data")
+@cache.cached(timeout=30, query_string=True, response_filter=_is_cacheable_response)
+def get_games_played_chart_data():
+    """Get games played chart series for client-side rendering."""
+    return _chart_data_response("games_played")
 
-        # Add grid for better readability
-        ax.grid(axis="y", linestyle="--", alpha=0.7)
 
-        # Add legend
-        ax.legend(fontsize=10)
+@app.route("/api/chart/win_rates")
+def get_win_rate_chart():
+    """Redirect to the win rate chart image (formerly base64-encoded JSON)."""
+    return redirect(url_for("get_win_rate_image"), code=301)
+
 
-        # Adjust layout
-        plt.tight_layout()
+@app.route("/api/chart/games_played")
+def get_games_played_chart():
+    """Redirect to the games played chart image (formerly base64-encoded JSON)."""
+    return redirect(url_for("get_games_played_image"), code=301)
 
-        # Save chart to memory with optimized settings
-        img = io.BytesIO()
-        plt.savefig(img, format="png", dpi=120, bbox_inches="tight", pad_inches=0.2)
-        img.seek(0)
 
-        # Close the figure to free memory
-        plt.close(fig)
+@app.route("/api/chart/win_rates/image")
+@app.route("/chart/win_rates.png")
+def get_win_rate_image():
+    """Generate a win rate chart and return it directly as an image."""
+    return _chart_image_response("win_rates")
 
-        # Return the image directly
-        response = make_response(img.getvalue())
-        response.headers["Content-Type"] = "image/png"
-        response.headers["Cache-Control"] = "max-age=300"  # Cache for 5 minutes
 
-        return response
-    except Exception as e:
-        return make_response(str(e), 500)
+@app.route("/api/chart/games_played/image")
+@app.route("/chart/games_played.png")
+def get_games_played_image():
+    """Generate a games played chart and return it directly as an image."""
+    return _chart_image_response("games_played")
 
 
 if __name__ == "__main__":
@@ -1023,7 +1273,7 @@ if __name__ == "__main__":
         import argparse
 
         parser = argparse.ArgumentParser(description="LLM Mafia Dashboard")
-        default_port = int(os.getenv("PORT", "5000"))
+        default_port = int(config.ENV.get("PORT", "5000"))
         parser.add_argument(
             "--port", type=int, default=default_port, help="Port to run the server on"
         )
@@ -1031,7 +1281,13 @@ if __name__ == "__main__":
 
         # Run the app
         print(f"Starting the dashboard application on port {args.port}...")
-        debug = os.getenv("FLASK_DEBUG", "").lower() == "true"
-        app.run(debug=debug, host="0.0.0.0", port=args.port)
+        debug = config.ENV.get("FLASK_DEBUG", "").lower() == "true"
+        if debug:
+            app.run(debug=True, host="0.0.0.0", port=args.port)
+        else:
+            # Production WSGI server: threaded, with HTTP keep-alive
+            from waitress import serve
+
+            serve(app, host="0.0.0.0", port=args.port, threads=8)
     except Exception as e:
         print(f"Error starting application: {e}")
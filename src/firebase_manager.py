@@ -2,23 +2,83 @@
 
 from __future__ import annotations
 
-import json
 import os
 import sys
+import threading
 import time
 from collections import defaultdict
 from contextlib import contextmanager
 from typing import Any
 
+import orjson
 import psycopg
 from psycopg.rows import dict_row
+from psycopg_pool import ConnectionPool
 
+# Import config under a single module name so it is only initialized once,
+# whether this module is loaded as ``firebase_manager`` or ``src.firebase_manager``.
 try:
-    import src.config as config
+    import config
 except ImportError:
-    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    sys.path.append(os.path.dirname(os.path.abspath(__file__)))
     import config
 
+GAME_RESULTS_BATCH_SIZE = 500
+
+# Older rows stored milliseconds; this reads every game timestamp in seconds.
+# Sorting on it (backed by an expression index) keeps those rows in order.
+TIMESTAMP_SECONDS_SQL = (
+    "(CASE WHEN timestamp > 10000000000 THEN timestamp / 1000 ELSE timestamp END)"
+)
+
+UPSERT_GAME_RESULT_SQL = """
+    INSERT INTO mafia_games (game_id, timestamp, game_type, language, participant_count, winner, participants)
+    VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb)
+    ON CONFLICT (game_id) DO UPDATE SET
+        timestamp = EXCLUDED.timestamp,
+        game_type = EXCLUDED.game_type,
+        language = EXCLUDED.language,
+        participant_count = EXCLUDED.participant_count,
+        winner = EXCLUDED.winner,
+        participants = EXCLUDED.participants;
+"""
+
+UPSERT_GAME_LOG_SQL = """
+    INSERT INTO game_logs (game_id, timestamp, game_type, language, participant_count, rounds, critic_review)
+    VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb)
+    ON CONFLICT (game_id) DO UPDATE SET
+        timestamp = EXCLUDED.timestamp,
+        game_type = EXCLUDED.game_type,
+        language = EXCLUDED.language,
+        participant_count = EXCLUDED.participant_count,
+        rounds = EXCLUDED.rounds,
+        critic_review = EXCLUDED.critic_review;
+"""
+
+# One pool per database URL, shared by every manager in the process
+_pools: dict[str, ConnectionPool] = {}
+_pools_lock = threading.Lock()
+
+
+def _get_pool(database_url: str) -> ConnectionPool:
+    with _pools_lock:
+        pool = _pools.get(database_url)
+        if pool is None:
+            pool = ConnectionPool(
+                database_url,
+                kwargs={"row_factory": dict_row},
+                min_size=1,
+                max_size=config.DATABASE_POOL_SIZE,
+                open=True,
+            )
+            _pools[database_url] = pool
+        return pool
+
+
+def _dumps(value: Any) -> str:
+    # Non-string keys are stringified, as json.dumps did
+    return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+
 
 class FirebaseManager:
     """Backward-compatible data access layer now powered by PostgreSQL."""
@@ -40,12 +100,9 @@ class FirebaseManager:
 
     @contextmanager
     def _connection(self):
-        conn = psycopg.connect(self.database_url, row_factory=dict_row)
-        try:
+        # The pool commits on a clean exit and rolls back on error
+        with _get_pool(self.database_url).connection() as conn:
             yield conn
-            conn.commit()
-        finally:
-            conn.close()
 
     def _ensure_schema(self) -> None:
         with self._connection() as conn:
@@ -82,12 +139,127 @@ class FirebaseManager:
                     ON mafia_games(timestamp DESC);
                     """
                 )
+                cur.execute(
+                    f"""
+                    CREATE INDEX IF NOT EXISTS idx_mafia_games_timestamp_seconds
+                    ON mafia_games({TIMESTAMP_SECONDS_SQL} DESC, game_id DESC);
+                    """
+                )
                 cur.execute(
                     """
                     CREATE INDEX IF NOT EXISTS idx_mafia_games_game_type
                     ON mafia_games(game_type);
                     """
                 )
+                self._ensure_model_stats_schema(cur)
+
+    def _ensure_model_stats_schema(self, cur) -> None:
+        """Maintain per-model totals in `model_stats` via a trigger on `mafia_games`.
+
+        Reads then cost O(#models) instead of re-aggregating every game.
+        """
+        cur.execute("SELECT to_regclass('model_stats') IS NULL AS missing;")
+        needs_backfill = cur.fetchone()["missing"]
+
+        cur.execute(
+            """
+            CREATE TABLE IF NOT EXISTS model_stats (
+                model_name TEXT PRIMARY KEY,
+                games_played INTEGER NOT NULL DEFAULT 0,
+                games_won INTEGER NOT NULL DEFAULT 0,
+                mafia_games INTEGER NOT NULL DEFAULT 0,
+                mafia_wins INTEGER NOT NULL DEFAULT 0,
+                villager_games INTEGER NOT NULL DEFAULT 0,
+                villager_wins INTEGER NOT NULL DEFAULT 0,
+                doctor_games INTEGER NOT NULL DEFAULT 0,
+                doctor_wins INTEGER NOT NULL DEFAULT 0
+            );
+            """
+        )
+        # One row per participant; supports both the object and the legacy
+        # "model name -> role string" participant formats.
+        cur.execute(
+            """
+            CREATE OR REPLACE FUNCTION mafia_game_participant_roles(p_participants JSONB)
+            RETURNS TABLE (model_name TEXT, role TEXT)
+            LANGUAGE sql IMMUTABLE AS $$
+                SELECT
+                    CASE WHEN jsonb_typeof(p.value) = 'object'
+                        THEN COALESCE(p.value->>'model_name', p.key) ELSE p.key END,
+                    CASE WHEN jsonb_typeof(p.value) = 'object'
+                        THEN p.value->>'role' ELSE p.value #>> '{}' END
+                FROM jsonb_each(p_participants) AS p
+            $$;
+            """
+        )
+        cur.execute(
+            """
+            CREATE OR REPLACE FUNCTION apply_model_stats(p_participants JSONB, p_winner TEXT, p_sign INTEGER)
+            RETURNS VOID
+            LANGUAGE sql AS $$
+                INSERT INTO model_stats AS s (
+                    model_name, games_played, games_won,
+                    mafia_games, mafia_wins, villager_games, villager_wins, doctor_games, doctor_wins
+                )
+                SELECT
+                    r.model_name,
+                    p_sign * COUNT(*),
+                    p_sign * COUNT(*) FILTER (
+                        WHERE (r.role = 'Mafia' AND p_winner = 'Mafia')
+                           OR (r.role IN ('Villager', 'Doctor') AND p_winner = 'Villagers')
+                    ),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Mafia'),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Mafia' AND p_winner = 'Mafia'),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Villager'),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Villager' AND p_winner = 'Villagers'),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Doctor'),
+                    p_sign * COUNT(*) FILTER (WHERE r.role = 'Doctor' AND p_winner = 'Villagers')
+                FROM mafia_game_participant_roles(p_participants) AS r
+                GROUP BY r.model_name
+                ON CONFLICT (model_name) DO UPDATE SET
+                    games_played = s.games_played + EXCLUDED.games_played,
+                    games_won = s.games_won + EXCLUDED.games_won,
+                    mafia_games = s.mafia_games + EXCLUDED.mafia_games,
+                    mafia_wins = s.mafia_wins + EXCLUDED.mafia_wins,
+                    villager_games = s.villager_games + EXCLUDED.villager_games,
+                    villager_wins = s.villager_wins + EXCLUDED.villager_wins,
+                    doctor_games = s.doctor_games + EXCLUDED.doctor_games,
+                    doctor_wins = s.doctor_wins + EXCLUDED.doctor_wins;
+            $$;
+            """
+        )
+        cur.execute(
+            """
+            CREATE OR REPLACE FUNCTION update_model_stats()
+            RETURNS TRIGGER
+            LANGUAGE plpgsql AS $$
+            BEGIN
+                IF TG_OP IN ('UPDATE', 'DELETE') THEN
+                    PERFORM apply_model_stats(OLD.participants, OLD.winner, -1);
+                END IF;
+                IF TG_OP IN ('INSERT', 'UPDATE') THEN
+                    PERFORM apply_model_stats(NEW.participants, NEW.winner, 1);
+                END IF;
+                RETURN NULL;
+            END;
+            $$;
+            """
+        )
+        cur.execute(
+            """
+            CREATE OR REPLACE TRIGGER mafia_games_model_stats
+            AFTER INSERT OR UPDATE OR DELETE ON mafia_games
+            FOR EACH ROW EXECUTE FUNCTION update_model_stats();
+            """
+        )
+
+        if needs_backfill:
+            cur.execute(
+                """
+                SELECT apply_model_stats(participants, winner, 1)
+                FROM mafia_games;
+                """
+            )
 
     def _normalize_participants(self, participants: dict[str, Any]) -> list[dict[str, Any]]:
         normalized = []
@@ -122,42 +294,53 @@ class FirebaseManager:
             raise TypeError("participants must be a dictionary keyed by player name")
         return participants
 
-    def _validate_rounds(self, rounds: Any) -> list[Any]:
+    def _validate_rounds(self, rounds: Any) -> list[Any] | str:
+        # Simulations hand over rounds already encoded as a JSON array
+        if isinstance(rounds, str):
+            if not rounds.startswith("["):
+                raise TypeError("encoded rounds must be a JSON array")
+            return rounds
         if not isinstance(rounds, list):
             raise TypeError("rounds must be a list")
         return rounds
 
+    def _game_result_row(self, game_id, winner, participants, game_type, language):
+        validated_participants = self._validate_participants(participants)
+        return (
+            game_id,
+            int(time.time()),
+            game_type,
+            language,
+            len(validated_participants),
+            winner,
+            _dumps(validated_participants),
+        )
+
+    def _game_log_row(self, game_id, rounds, participants, game_type, language, critic_review):
+        validated_participants = self._validate_participants(participants)
+        validated_rounds = self._validate_rounds(rounds)
+        return (
+            game_id,
+            int(time.time()),
+            game_type,
+            language,
+            len(validated_participants),
+            validated_rounds
+            if isinstance(validated_rounds, str)
+            else _dumps(validated_rounds),
+            _dumps(critic_review) if critic_review else None,
+        )
+
     def store_game_result(self, game_id, winner, participants, game_type=config.GAME_TYPE, language=config.LANGUAGE):
         if not self.initialized:
             print("Database not initialized. Cannot store game result.")
             return False
 
         try:
-            validated_participants = self._validate_participants(participants)
+            row = self._game_result_row(game_id, winner, participants, game_type, language)
             with self._connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO mafia_games (game_id, timestamp, game_type, language, participant_count, winner, participants)
-                        VALUES (%s, %s, %s, %s, %s, %s, %s::jsonb)
-                        ON CONFLICT (game_id) DO UPDATE SET
-                            timestamp = EXCLUDED.timestamp,
-                            game_type = EXCLUDED.game_type,
-                            language = EXCLUDED.language,
-                            participant_count = EXCLUDED.participant_count,
-                            winner = EXCLUDED.winner,
-                            participants = EXCLUDED.participants;
-                        """,
-                        (
-                            game_id,
-                            int(time.time()),
-                            game_type,
-                            language,
-                            len(validated_participants),
-                            winner,
-                            json.dumps(validated_participants),
-                        ),
-                    )
+                    cur.execute(UPSERT_GAME_RESULT_SQL, row)
             return True
         except (psycopg.Error, TypeError, ValueError) as exc:
             print(f"Error storing game result: {exc}")
@@ -169,124 +352,157 @@ class FirebaseManager:
             return False
 
         try:
-            validated_participants = self._validate_participants(participants)
-            validated_rounds = self._validate_rounds(rounds)
+            row = self._game_log_row(
+                game_id, rounds, participants, game_type, language, critic_review
+            )
             with self._connection() as conn:
                 with conn.cursor() as cur:
-                    cur.execute(
-                        """
-                        INSERT INTO game_logs (game_id, timestamp, game_type, language, participant_count, rounds, critic_review)
-                        VALUES (%s, %s, %s, %s, %s, %s::jsonb, %s::jsonb)
-                        ON CONFLICT (game_id) DO UPDATE SET
-                            timestamp = EXCLUDED.timestamp,
-                            game_type = EXCLUDED.game_type,
-                            language = EXCLUDED.language,
-                            participant_count = EXCLUDED.participant_count,
-                            rounds = EXCLUDED.rounds,
-                            critic_review = EXCLUDED.critic_review;
-                        """,
-                        (
-                            game_id,
-                            int(time.time()),
-                            game_type,
-                            language,
-                            len(validated_participants),
-                            json.dumps(validated_rounds),
-                            json.dumps(critic_review) if critic_review else None,
-                        ),
-                    )
+                    cur.execute(UPSERT_GAME_LOG_SQL, row)
             return True
         except (psycopg.Error, TypeError, ValueError) as exc:
             print(f"Error storing game log: {exc}")
             return False
 
+    def store_games_batch(self, games):
+        """Store the results and logs of several games in one transaction.
+
+        Each game is a dict with game_id, winner, participants and rounds, plus
+        optional game_type, language and critic_review keys. Invalid games are
+        skipped, and if the batched write fails each game is retried on its
+        own so one bad row cannot take the rest of the batch down with it.
+
+        Returns the number of games stored.
+        """
+        if not self.initialized:
+            print("Database not initialized. Cannot store games.")
+            return 0
+
+        valid_games = []
+        result_rows = []
+        log_rows = []
+        for game in games:
+            try:
+                game_type = game.get("game_type", config.GAME_TYPE)
+                language = game.get("language", config.LANGUAGE)
+                result_row = self._game_result_row(
+                    game["game_id"], game["winner"], game["participants"], game_type, language
+                )
+                log_row = self._game_log_row(
+                    game["game_id"],
+                    game["rounds"],
+                    game["participants"],
+                    game_type,
+                    language,
+                    game.get("critic_review"),
+                )
+            except (AttributeError, KeyError, TypeError, ValueError) as exc:
+                game_id = game.get("game_id") if isinstance(game, dict) else None
+                print(f"Skipping invalid game {game_id}: {exc}")
+                continue
+            valid_games.append(game)
+            result_rows.append(result_row)
+            log_rows.append(log_row)
+
+        if not valid_games:
+            return 0
+
+        try:
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    # Results first: game_logs references mafia_games
+                    cur.executemany(UPSERT_GAME_RESULT_SQL, result_rows)
+                    cur.executemany(UPSERT_GAME_LOG_SQL, log_rows)
+            return len(valid_games)
+        except psycopg.Error as exc:
+            print(f"Error storing games batch, retrying games one by one: {exc}")
+
+        stored = 0
+        for game in valid_games:
+            game_type = game.get("game_type", config.GAME_TYPE)
+            language = game.get("language", config.LANGUAGE)
+            if self.store_game_result(
+                game["game_id"], game["winner"], game["participants"], game_type, language
+            ) and self.store_game_log(
+                game["game_id"],
+                game["rounds"],
+                game["participants"],
+                game_type,
+                language,
+                game.get("critic_review"),
+            ):
+                stored += 1
+        return stored
+
     def get_game_results(self, limit=100):
         if not self.initialized:
             print("Database not initialized. Cannot get game results.")
             return []
 
         try:
-            with self._connection() as conn:
-                with conn.cursor() as cur:
-                    if limit is None:
-                        cur.execute(
-                            """
-                            SELECT game_id, timestamp, game_type, language, participant_count, winner, participants
-                            FROM mafia_games
-                            ORDER BY timestamp DESC;
-                            """
-                        )
-                    else:
-                        cur.execute(
-                            """
-                            SELECT game_id, timestamp, game_type, language, participant_count, winner, participants
-                            FROM mafia_games
-                            ORDER BY timestamp DESC
-                            LIMIT %s;
-                            """,
-                            (limit,),
-                        )
-                    rows = cur.fetchall()
-            for row in rows:
-                if isinstance(row.get("participants"), str):
-                    row["participants"] = json.loads(row["participants"])
-            return rows
-        except (psycopg.Error, json.JSONDecodeError, TypeError) as exc:
+            return list(self.iter_game_results(limit=limit))
+        except (psycopg.Error, orjson.JSONDecodeError, TypeError) as exc:
             print(f"Error getting game results: {exc}")
             return []
 
+    def iter_game_results(self, limit=None, oldest_first=False):
+        """Yield game results one at a time, newest first by default.
+
+        Rows come from a server-side cursor in batches, so memory stays flat
+        however many games are read. The connection is held until the
+        generator is exhausted or closed. Database errors propagate to the
+        caller.
+        """
+        if not self.initialized:
+            print("Database not initialized. Cannot get game results.")
+            return
+
+        # Both directions sort on the converted timestamp, with game_id as the
+        # tie-breaker, so idx_mafia_games_timestamp_seconds serves either one
+        direction = "ASC" if oldest_first else "DESC"
+        with self._connection() as conn:
+            with conn.cursor(name="game_results") as cur:
+                cur.execute(
+                    f"""
+                    SELECT game_id,
+                           {TIMESTAMP_SECONDS_SQL} AS timestamp,
+                           game_type, language, participant_count, winner, participants
+                    FROM mafia_games
+                    ORDER BY {TIMESTAMP_SECONDS_SQL} {direction}, game_id {direction}
+                    LIMIT %s;
+                    """,
+                    (limit,),
+                )
+                while batch := cur.fetchmany(GAME_RESULTS_BATCH_SIZE):
+                    for row in batch:
+                        if isinstance(row.get("participants"), str):
+                            row["participants"] = orjson.loads(row["participants"])
+                        yield row
+
     def get_model_stats(self):
         if not self.initialized:
             print("Database not initialized. Cannot get model stats.")
             return {}
 
         try:
-            results = self.get_game_results(limit=1000)
-            stats: dict[str, dict[str, Any]] = {}
-
-            for game in results:
-                winner = game.get("winner")
-                participants = game.get("participants", {})
-
-                for player_name, data in participants.items():
-                    if isinstance(data, dict):
-                        role = data.get("role")
-                        model = data.get("model_name", player_name)
-                    else:
-                        role = data
-                        model = player_name
-
-                    if model not in stats:
-                        stats[model] = {
-                            "games_played": 0,
-                            "games_won": 0,
-                            "mafia_games": 0,
-                            "mafia_wins": 0,
-                            "villager_games": 0,
-                            "villager_wins": 0,
-                            "doctor_games": 0,
-                            "doctor_wins": 0,
-                        }
-
-                    stats[model]["games_played"] += 1
+            with self._connection() as conn:
+                with conn.cursor() as cur:
+                    cur.execute(
+                        """
+                        SELECT model_name, games_played, games_won,
+                               mafia_games, mafia_wins, villager_games, villager_wins,
+                               doctor_games, doctor_wins
+                        FROM model_stats
+                        WHERE games_played > 0;
+                        """
+                    )
+                    rows = cur.fetchall()
 
-                    if role == "Mafia":
-                        stats[model]["mafia_games"] += 1
-                        if winner == "Mafia":
-                            stats[model]["mafia_wins"] += 1
-                            stats[model]["games_won"] += 1
-                    elif role == "Doctor":
-                        stats[model]["doctor_games"] += 1
-                        if winner == "Villagers":
-                            stats[model]["doctor_wins"] += 1
-                            stats[model]["games_won"] += 1
-                    elif role == "Villager":
-                        stats[model]["villager_games"] += 1
-                        if winner == "Villagers":
-                            stats[model]["villager_wins"] += 1
-                            stats[model]["games_won"] += 1
+            stats: dict[str, dict[str, Any]] = {
+                row.pop("model_name"): row for row in rows
+            }
 
             for model in stats:
+                stats[model]["short_name"] = model.rsplit("/", 1)[-1]
                 played = stats[model]["games_played"]
                 mafia_games = stats[model]["mafia_games"]
                 villager_games = stats[model]["villager_games"]
@@ -308,10 +524,6 @@ class FirebaseManager:
             return None
 
         try:
-            results = sorted(
-                self.get_game_results(limit=None),
-                key=lambda game: (game.get("timestamp", 0), game.get("game_id", "")),
-            )
 
             appearances = []
             opponent_stats: dict[str, dict[str, Any]] = defaultdict(
@@ -336,7 +548,8 @@ class FirebaseManager:
             best_win_streak = 0
             worst_loss_streak = 0
 
-            for game in results:
+            # Streamed oldest first; only this model's games are kept
+            for game in self.iter_game_results(oldest_first=True):
                 participants = self._normalize_participants(game.get("participants", {}))
                 matching = [
                     participant
@@ -2,15 +2,68 @@
 Game logic for the LLM Mafia Game Competition.
 """
 
+import concurrent.futures
 import random
 import uuid
+from collections import Counter, defaultdict
 from player import Player
-from game_templates import Role
+from game_templates import (
+    Role,
+    MAFIA_NIGHT_INSTRUCTION,
+    DOCTOR_NIGHT_INSTRUCTIONS,
+    DAY_DISCUSSION_INSTRUCTION,
+    DAY_VOTING_INSTRUCTION,
+    LAST_WORDS_INSTRUCTION,
+    DAY_ROLE_WARNINGS,
+    VOTING_REMINDERS,
+    BATCH_CONFIRMATION_TEMPLATE,
+)
 import config
 from logger import GameLogger, Color
-import re
-import json
-from openrouter import get_llm_response
+import orjson
+from openrouter import get_llm_responses, submit_llm_response
+
+# config.ROLE_ASSIGNMENT resolved to Role members once at import
+ROLE_ASSIGNMENT = tuple(Role(role) for role in config.ROLE_ASSIGNMENT)
+
+
+def _extract_json_object(text):
+    """
+    Find the first balanced {...} object in a model reply.
+
+    Braces inside JSON string literals are skipped, so prose or a second
+    object after the first one is never swallowed into it.
+
+    Args:
+        text (str): The model's reply.
+
+    Returns:
+        str or None: The object's source text, or None if there is none.
+    """
+    start = text.find("{")
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = False
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start : index + 1]
+    return None
 
 
 class MafiaGame:
@@ -20,18 +73,48 @@ class MafiaGame:
         """
         Initialize a Mafia game.
 
+        Args:
+            models (list, optional): List of model names to use as players.
+            language (str, optional): Language for game prompts and interactions. Defaults to config.LANGUAGE.
+        """
+        config.validate_role_counts()
+
+        # Created by reset(), which opens a log file per game
+        self.logger = None
+
+        self.reset(models=models, language=language)
+
+    def reset(self, models=None, language=None):
+        """
+        Return the game to its pre-setup state so the instance can be reused.
+
+        Every piece of per-game state is replaced with a fresh object rather
+        than cleared in place, so results returned by a previous run_game()
+        are unaffected. The logger is kept, but writes to a new log file
+        named after the new game ID.
+
         Args:
             models (list, optional): List of model names to use as players.
             language (str, optional): Language for game prompts and interactions. Defaults to config.LANGUAGE.
         """
         self.game_id = str(uuid.uuid4())
+        if self.logger is None:
+            self.logger = GameLogger(log_id=self.game_id)
+        else:
+            self.logger.open_log_file(self.game_id)
         self.round_number = 0
         self.phase = "setup"  # setup, night, day
         self.players: list[Player] = []
         self.mafia_players: list[Player] = []
         self.doctor_player: Player | None = None
         self.villager_players: list[Player] = []
-        self.discussion_history = ""
+        self._players_by_name: dict[str, Player] = {}
+        # Cached results of get_alive_players() and _alive_role_counts();
+        # reset by _eliminate
+        self._alive_players: list[Player] | None = None
+        self._alive_counts: tuple[int, int, int] | None = None
+        # Discussion messages, appended by _add_to_history and joined on read
+        self._history_parts: list[str] = []
         self.rounds_data = []
         self.language = language if language is not None else config.LANGUAGE
         self.current_round_data = {
@@ -54,9 +137,6 @@ class MafiaGame:
         if config.RANDOM_SEED is not None:
             random.seed(config.RANDOM_SEED)
 
-        # Initialize logger
-        self.logger = GameLogger()
-
     def setup_game(self):
         """
         Set up the game by assigning roles to players.
@@ -80,44 +160,23 @@ class MafiaGame:
         else:
             selected_models = random.choices(self.models, k=config.PLAYERS_PER_GAME)
 
-        # Assign roles
-        roles = []
-
-        # Add Mafia roles
-        for _ in range(config.MAFIA_COUNT):
-            roles.append(Role.MAFIA)
-
-        # Add Doctor roles
-        for _ in range(config.DOCTOR_COUNT):
-            roles.append(Role.DOCTOR)
+        # Assign roles in random order
+        roles = random.sample(ROLE_ASSIGNMENT, len(ROLE_ASSIGNMENT))
 
-        # Add Villager roles
-        villager_count = (
-            config.PLAYERS_PER_GAME - config.MAFIA_COUNT - config.DOCTOR_COUNT
+        # Give players distinct random names instead of their model names,
+        # numbering any players beyond the size of the name pool
+        names = random.sample(
+            player_names, min(len(player_names), config.PLAYERS_PER_GAME)
         )
-        for _ in range(villager_count):
-            roles.append(Role.VILLAGER)
-
-        # Shuffle roles
-        random.shuffle(roles)
+        names += [f"Player_{i+1}" for i in range(len(names), config.PLAYERS_PER_GAME)]
 
         # Create players
         self.logger.header("PLAYER SETUP", Color.CYAN)
         for i, model_name in enumerate(selected_models):
-            # Generate a random player name instead of using model name
-            # Make sure we don't reuse names
-            used_names = [p.player_name for p in self.players]
-            available_names = [name for name in player_names if name not in used_names]
-
-            # If we somehow run out of names, add a number to the model name
-            if not available_names:
-                player_name = f"Player_{i+1}"
-            else:
-                player_name = random.choice(available_names)
-
             # Create player with both model_name and player_name
-            player = Player(model_name, player_name, roles[i], language=self.language)
+            player = Player(model_name, names[i], roles[i], language=self.language)
             self.players.append(player)
+            self._players_by_name[player.player_name] = player
 
             # Add to role-specific lists
             if player.role == Role.MAFIA:
@@ -155,10 +214,8 @@ class MafiaGame:
         Returns:
             str: The current game state.
         """
-        alive_count = sum(1 for p in self.players if p.alive)
-        mafia_count = sum(1 for p in self.mafia_players if p.alive)
-        villager_count = sum(1 for p in self.villager_players if p.alive)
-        doctor_count = 1 if self.doctor_player and self.doctor_player.alive else 0
+        mafia_count, villager_count, doctor_count = self._alive_role_counts()
+        alive_count = mafia_count + villager_count + doctor_count
 
         state = f"Round {self.round_number}, {self.phase.capitalize()} phase. "
         state += f"{alive_count} players alive ({mafia_count} Mafia, {villager_count + doctor_count} Villagers/Doctor). "
@@ -172,10 +229,45 @@ class MafiaGame:
         """
         Get a list of alive players.
 
+        The list is shared between calls until the next elimination, so
+        callers must not modify it.
+
         Returns:
             list: List of alive players.
         """
-        return [p for p in self.players if p.alive]
+        if self._alive_players is None:
+            self._alive_players = [p for p in self.players if p.alive]
+        return self._alive_players
+
+    def _alive_role_counts(self):
+        """
+        Count the alive players of each role, in one pass.
+
+        Returns:
+            tuple: (mafia, villagers, doctors) alive, cached until the next elimination.
+        """
+        if self._alive_counts is None:
+            mafia = villagers = doctors = 0
+            for player in self.get_alive_players():
+                if player.role == Role.MAFIA:
+                    mafia += 1
+                elif player.role == Role.DOCTOR:
+                    doctors += 1
+                else:
+                    villagers += 1
+            self._alive_counts = (mafia, villagers, doctors)
+        return self._alive_counts
+
+    def _eliminate(self, player):
+        """
+        Mark a player as dead.
+
+        Args:
+            player (Player): The player to remove from the game.
+        """
+        player.alive = False
+        self._alive_players = None
+        self._alive_counts = None
 
     def check_game_over(self):
         """
@@ -185,9 +277,7 @@ class MafiaGame:
             tuple: (is_game_over, winner) where winner is "Mafia" or "Villagers" or None.
         """
         # Count alive players by role
-        mafia_alive = sum(1 for p in self.mafia_players if p.alive)
-        villagers_alive = sum(1 for p in self.villager_players if p.alive)
-        doctor_alive = 1 if self.doctor_player and self.doctor_player.alive else 0
+        mafia_alive, villagers_alive, doctor_alive = self._alive_role_counts()
 
         # Check win conditions
         if mafia_alive == 0:
@@ -203,29 +293,30 @@ class MafiaGame:
 
         return False, None
 
+    @property
+    def discussion_history(self):
+        """str: The full discussion history."""
+        return "".join(self._history_parts)
+
     def discussion_history_without_thinkings(self):
         """
         Get the discussion history for the current round, excluding thinking messages.
-        Removes any <think></think> or <THINK></THINK> tags and their contents.
-        If a closing tag is missing, removes everything from the opening tag to the end of the string.
-        """
-        # First handle properly closed tags (both lowercase and uppercase)
-        discussion_history_without_thinkings = re.sub(
-            r"<[tT][hH][iI][nN][kK]>.*?</[tT][hH][iI][nN][kK]>",
-            "",
-            self.discussion_history,
-            flags=re.DOTALL,
-        )
 
-        # Then handle any unclosed tags - remove from opening tag to the end of the string
-        discussion_history_without_thinkings = re.sub(
-            r"<[tT][hH][iI][nN][kK]>.*$",
-            "",
-            discussion_history_without_thinkings,
-            flags=re.DOTALL,
-        )
+        Responses are stripped of <think> blocks (any case, closed or not)
+        by Player.process_response as they arrive, so the history never
+        holds them and this is the same text as discussion_history.
+        """
+        return "".join(self._history_parts)
+
+    def _add_to_history(self, player_name, message):
+        """
+        Append a message to the discussion history.
 
-        return discussion_history_without_thinkings
+        Args:
+            player_name (str): The visible name of the speaker.
+            message (str): The message text, already cleaned of thinking.
+        """
+        self._history_parts.append(f"{player_name}: {message}\n\n")
 
     def execute_night_phase(self):
         """
@@ -240,76 +331,97 @@ class MafiaGame:
         for player in self.players:
             player.protected = False
 
-        # Get actions from Mafia players
-        mafia_targets = []
-        for player in self.mafia_players:
-            if player.alive:
-                # Generate prompt
-                game_state = f"{self.get_game_state()} It's night time (Round {self.round_number}). As the Mafia, you MUST choose exactly one player to kill tonight. You cannot skip this action. End your response with ACTION: Kill [player]."
-                prompt = player.generate_prompt(
-                    game_state,
-                    self.get_alive_players(),
-                    self.mafia_players,
-                    self.discussion_history_without_thinkings(),
-                )
+        alive_mafia = [player for player in self.mafia_players if player.alive]
+        doctor = (
+            self.doctor_player
+            if self.doctor_player and self.doctor_player.alive
+            else None
+        )
 
-                # Get response
-                response = player.get_response(prompt)
-                self.logger.player_response(
-                    player.model_name, "Mafia", response, player.player_name
+        # Night actions don't see each other, so ask every player at once,
+        # from one snapshot of the game state and history
+        state = self.get_game_state()
+        history = self.discussion_history_without_thinkings()
+        mafia_state = f"{state} {MAFIA_NIGHT_INSTRUCTION.format(round_number=self.round_number)}"
+        night_prompts = []
+        for player in alive_mafia:
+            night_prompts.append(
+                (
+                    player,
+                    *player.generate_prompt_parts(
+                        mafia_state,
+                        self.get_alive_players(),
+                        self.mafia_players,
+                        history,
+                    ),
                 )
+            )
 
-                # Add to messages with night phase marker
-                self.current_round_data["messages"].append(
-                    {
-                        "speaker": player.model_name,
-                        "content": response,
-                        "phase": "night",
-                        "role": "Mafia",
-                        "player_name": player.player_name,
-                    }
+        if doctor:
+            # Get the appropriate instruction based on the doctor's language
+            instruction = DOCTOR_NIGHT_INSTRUCTIONS.get(
+                doctor.language, DOCTOR_NIGHT_INSTRUCTIONS["English"]
+            ).format(round_number=self.round_number)
+
+            night_prompts.append(
+                (
+                    doctor,
+                    *doctor.generate_prompt_parts(
+                        f"{state} {instruction}",
+                        self.get_alive_players(),
+                        None,
+                        history,
+                    ),
                 )
+            )
 
-                # Parse action
-                action_type, target = player.parse_night_action(
-                    response, self.get_alive_players()
-                )
+        night_responses = self._get_responses(night_prompts, phase="night")
 
-                if action_type == "kill" and target:
-                    mafia_targets.append(target)
-                    action_text = f"Kill {target.player_name}"
-                    self.current_round_data["actions"][player.model_name] = action_text
-                    self.logger.player_action(
-                        player.model_name, "Mafia", action_text, player.player_name
-                    )
-                else:
-                    self.logger.error(
-                        f"Invalid action from {player.model_name} (Mafia)"
-                    )
-                    self.current_round_data["actions"][
-                        player.model_name
-                    ] = "Invalid action"
+        # Get actions from Mafia players
+        mafia_targets = []
+        for player, response in zip(alive_mafia, night_responses):
+            self.logger.player_response(
+                player.model_name, "Mafia", response, player.player_name
+            )
+
+            # Add to messages with night phase marker
+            self.current_round_data["messages"].append(
+                {
+                    "speaker": player.model_name,
+                    "content": response,
+                    "phase": "night",
+                    "role": "Mafia",
+                    "player_name": player.player_name,
+                }
+            )
+
+            # Parse action
+            action_type, target = player.parse_night_action(
+                response, self.get_alive_players()
+            )
+
+            if action_type == "kill" and target:
+                mafia_targets.append(target)
+                action_text = f"Kill {target.player_name}"
+                self.current_round_data["actions"][player.model_name] = action_text
+                self.logger.player_action(
+                    player.model_name, "Mafia", action_text, player.player_name
+                )
+            else:
+                self.logger.error(
+                    f"Invalid action from {player.model_name} (Mafia)"
+                )
+                self.current_round_data["actions"][
+                    player.model_name
+                ] = "Invalid action"
 
         # Determine Mafia kill target (majority vote)
         kill_target = None
         if mafia_targets:
-            # Count votes for each target
-            target_counts = {}
-            for target in mafia_targets:
-                if target.model_name in target_counts:
-                    target_counts[target.model_name] += 1
-                else:
-                    target_counts[target.model_name] = 1
-
-            # Find target with most votes
-            max_votes = 0
-            for target_name, votes in target_counts.items():
-                if votes > max_votes:
-                    max_votes = votes
-                    for player in self.get_alive_players():
-                        if player.model_name == target_name:
-                            kill_target = player
-                            break
+            # Count votes for each target; ties go to the first one named
+            target_counts = Counter(target.player_name for target in mafia_targets)
+            target_name, _ = target_counts.most_common(1)[0]
+            kill_target = self._players_by_name[target_name]
 
             # Record the final mafia target
             if kill_target:
@@ -319,30 +431,8 @@ class MafiaGame:
 
         # Get action from Doctor
         protected_player = None
-        if self.doctor_player and self.doctor_player.alive:
-            # Generate prompt with language-specific instructions
-            night_instructions = {
-                "English": f"It's night time (Round {self.round_number}). As the Doctor, you MUST choose exactly one player to protect from the Mafia tonight. You cannot skip this action. End your response with ACTION: Protect [player].",
-                "Spanish": f"Es hora de noche (Ronda {self.round_number}). Como Doctor, DEBES elegir exactamente a un jugador para proteger de la Mafia esta noche. No puedes omitir esta acción. Termina tu respuesta con ACCIÓN: Proteger [jugador].",
-                "French": f"C'est la nuit (Tour {self.round_number}). En tant que Docteur, vous DEVEZ choisir exactement un joueur à protéger de la Mafia ce soir. Vous ne pouvez pas ignorer cette action. Terminez votre réponse par ACTION: Protéger [joueur].",
-                "Korean": f"밤 시간입니다 (라운드 {self.round_number}). 의사로서, 당신은 오늘 밤 마피아로부터 보호할 플레이어를 정확히 한 명 선택해야 합니다. 이 행동을 건너뛸 수 없습니다. 응답 끝에 행동: 보호하기 [플레이어]를 포함하세요.",
-            }
-
-            # Get the appropriate instruction based on the doctor's language
-            instruction = night_instructions.get(
-                self.doctor_player.language, night_instructions["English"]
-            )
-
-            game_state = f"{self.get_game_state()} {instruction}"
-            prompt = self.doctor_player.generate_prompt(
-                game_state,
-                self.get_alive_players(),
-                None,
-                self.discussion_history_without_thinkings(),
-            )
-
-            # Get response
-            response = self.doctor_player.get_response(prompt)
+        if doctor:
+            response = night_responses[-1]
             self.logger.player_response(
                 self.doctor_player.model_name,
                 "Doctor",
@@ -391,7 +481,7 @@ class MafiaGame:
         # Process night actions
         eliminated_players = []
         if kill_target and not kill_target.protected:
-            kill_target.alive = False
+            self._eliminate(kill_target)
             eliminated_players.append(kill_target)
             self.current_round_data["eliminations"].append(kill_target.model_name)
             # We already added to targeted_by_mafia above
@@ -426,8 +516,7 @@ class MafiaGame:
         # Get alive players
         alive_players = self.get_alive_players()
 
-        # Collect messages and votes from all alive players
-        messages = []
+        # Collect votes from all alive players
         votes = {}
 
         # First round: Discussion without voting
@@ -435,8 +524,7 @@ class MafiaGame:
         self._conduct_player_interactions(
             alive_players,
             "day_discussion",
-            f"It's day time (Round {self.round_number}). Discuss with other players about who might be Mafia. This is the DISCUSSION PHASE ONLY - DO NOT VOTE YET. You will vote in the next round.",
-            messages,
+            DAY_DISCUSSION_INSTRUCTION.format(round_number=self.round_number),
             collect_votes=False,
         )
 
@@ -447,37 +535,28 @@ class MafiaGame:
         self._conduct_player_interactions(
             alive_players,
             "day_voting",
-            f"It's now the VOTING PHASE (Round {self.round_number}). Make your final arguments and YOU MUST VOTE to eliminate a suspected Mafia member. End your message with VOTE: [player name].",
-            messages,
+            DAY_VOTING_INSTRUCTION.format(round_number=self.round_number),
             collect_votes=True,
             votes=votes,
         )
 
         # Count votes
-        vote_counts = {}
-        vote_details = {}  # New dictionary to store who voted for whom
+        vote_counts = Counter(votes.values())
+        vote_details = defaultdict(list)  # Who voted for whom
         for voter, target_name in votes.items():
-            if target_name in vote_counts:
-                vote_counts[target_name] += 1
-            else:
-                vote_counts[target_name] = 1
-
-            # Store voter information for each target
-            if target_name not in vote_details:
-                vote_details[target_name] = []
             vote_details[target_name].append(voter)
+        vote_details = dict(vote_details)
 
-        # Find player with most votes
-        max_votes = 0
+        # Find player with most votes; ties go to the first one voted for.
+        # Votes are recorded by model name; with repeated models the first
+        # alive player of that model is meant.
         eliminated_player = None
-
-        for target_name, vote_count in vote_counts.items():
-            if vote_count > max_votes:
-                max_votes = vote_count
-                for player in alive_players:
-                    if player.model_name == target_name:
-                        eliminated_player = player
-                        break
+        if vote_counts:
+            alive_by_model = {}
+            for player in alive_players:
+                alive_by_model.setdefault(player.model_name, player)
+            target_name, _ = vote_counts.most_common(1)[0]
+            eliminated_player = alive_by_model[target_name]
 
         # Eliminate player with most votes
         eliminated_players = []
@@ -508,7 +587,7 @@ class MafiaGame:
                     eliminated_player, vote_counts[eliminated_player.model_name]
                 )
 
-                eliminated_player.alive = False
+                self._eliminate(eliminated_player)
                 eliminated_players.append(eliminated_player)
                 self.current_round_data["eliminations"].append(
                     eliminated_player.model_name
@@ -533,9 +612,7 @@ class MafiaGame:
                     self.current_round_data["last_words"] = last_words
                     self.logger.event(last_words_text, Color.CYAN)
                     # Add last words to discussion history
-                    self.discussion_history += (
-                        f"{eliminated_player.player_name}: {last_words}\n\n"
-                    )
+                    self._add_to_history(eliminated_player.player_name, last_words)
                     # Add to messages
                     self.current_round_data["messages"].append(
                         {
@@ -588,7 +665,6 @@ class MafiaGame:
         alive_players,
         phase_type,
         instruction,
-        messages,
         collect_votes=False,
         votes=None,
     ):
@@ -599,109 +675,188 @@ class MafiaGame:
             alive_players (list): List of alive players
             phase_type (str): Type of phase (day_discussion or day_voting)
             instruction (str): Specific instruction for this interaction round
-            messages (list): List to collect all messages
             collect_votes (bool): Whether to collect votes in this round
             votes (dict): Dictionary to store votes if collect_votes is True
         """
-        for player in alive_players:
-            # Generate prompt
-            game_state = f"{self.get_game_state()} {instruction}"
-
-            # Add special instruction for doctor during day phase
-            if player.role == Role.DOCTOR:
-                day_warnings = {
-                    "English": " IMPORTANT: This is the DAY phase. Do NOT use your protection ability now. Only use ACTION: Protect during night phase.",
-                    "Spanish": " IMPORTANTE: Esta es la fase DIURNA. NO uses tu habilidad de protección ahora. Solo usa ACCIÓN: Proteger durante la fase nocturna.",
-                    "French": " IMPORTANT: C'est la phase de JOUR. N'utilisez PAS votre capacité de protection maintenant. Utilisez ACTION: Protéger uniquement pendant la phase de nuit.",
-                    "Korean": " 중요: 지금은 낮 단계입니다. 지금은 보호 능력을 사용하지 마세요. 행동: 보호하기는 밤 단계에서만 사용하세요.",
-                }
-
-                # Get the appropriate warning based on the doctor's language
-                warning = day_warnings.get(player.language, day_warnings["English"])
-                game_state += warning
-
-            # Add special instruction for mafia players during day phase
-            elif player.role == Role.MAFIA:
-                day_warnings = {
-                    "English": " IMPORTANT: This is the DAY phase. Do NOT use 'ACTION: Kill' now. Instead, use 'VOTE: [player]' to vote like other villagers.",
-                    "Spanish": " IMPORTANTE: Esta es la fase DIURNA. NO uses 'ACCIÓN: Matar' ahora. En su lugar, usa 'VOTO: [jugador]' para votar como los demás aldeanos.",
-                    "French": " IMPORTANT: C'est la phase de JOUR. N'utilisez PAS 'ACTION: Tuer' maintenant. À la place, utilisez 'VOTE: [joueur]' pour voter comme les autres villageois.",
-                    "Korean": " 중요: 지금은 낮 단계입니다. '행동: 죽이기'를 사용하지 마세요. 대신 다른 마을 사람들처럼 '투표: [플레이어]'를 사용하여 투표하세요.",
-                }
-
-                # Get the appropriate warning based on the mafia player's language
-                warning = day_warnings.get(player.language, day_warnings["English"])
-                game_state += warning
-
-            # Add voting reminder for all players during voting phase
-            if phase_type == "day_voting":
-                voting_reminders = {
-                    "English": " REMINDER: This is the VOTING PHASE. You MUST end your message with 'VOTE: [player]' to cast your vote.",
-                    "Spanish": " RECORDATORIO: Esta es la fase de VOTACIÓN. DEBES terminar tu mensaje con 'VOTO: [jugador]' para emitir tu voto.",
-                    "French": " RAPPEL: C'est la phase de VOTE. Vous DEVEZ terminer votre message par 'VOTE: [joueur]' pour exprimer votre vote.",
-                    "Korean": " 알림: 지금은 투표 단계입니다. 반드시 메시지 끝에 '투표: [플레이어]'를 포함하여 투표해야 합니다.",
-                }
-
-                # Get the appropriate reminder based on the player's language
-                reminder = voting_reminders.get(
-                    player.language, voting_reminders["English"]
+        # The game state does not change while players speak, so the shared
+        # part of every prompt is formatted once per round
+        game_state = f"{self.get_game_state()} {instruction}"
+
+        if config.PARALLEL_DAY_DISCUSSION:
+            # Everyone answers the same snapshot of the discussion, so all
+            # players can be asked at once; responses are then recorded in
+            # turn order.
+            history = self.discussion_history_without_thinkings()
+            prompts = [
+                (
+                    player,
+                    *self._day_prompt(
+                        player, alive_players, phase_type, game_state, history
+                    ),
+                )
+                for player in alive_players
+            ]
+            responses = self._get_responses(prompts, phase=phase_type)
+            for player, response in zip(alive_players, responses):
+                self._record_day_response(
+                    player,
+                    response,
+                    alive_players,
+                    phase_type,
+                    collect_votes,
+                    votes,
                 )
-                game_state += reminder
+            return
 
-            prompt = player.generate_prompt(
-                game_state,
+        for player in alive_players:
+            # Each player sees what earlier speakers said this round
+            system_prompt, prompt = self._day_prompt(
+                player,
                 alive_players,
-                self.mafia_players if player.role == Role.MAFIA else None,
+                phase_type,
+                game_state,
                 self.discussion_history_without_thinkings(),
             )
-
-            # Get response
-            response = player.get_response(prompt)
-            self.logger.player_response(
-                player.model_name, player.role.value, response, player.player_name
+            response = player.get_response(
+                prompt, system_prompt, player.decision_pattern(phase_type)
             )
-
-            # Add to messages
-            messages.append(
-                {
-                    "speaker": player.model_name,
-                    "content": response,
-                    "player_name": player.player_name,
-                }
+            self._record_day_response(
+                player,
+                response,
+                alive_players,
+                phase_type,
+                collect_votes,
+                votes,
             )
-            self.current_round_data["messages"].append(
-                {
-                    "speaker": player.model_name,
-                    "content": response,
-                    "phase": phase_type,
-                    "role": player.role.value,
-                    "player_name": player.player_name,
-                }
+
+    def _day_prompt(self, player, alive_players, phase_type, game_state, history):
+        """
+        Build a player's prompt for a day discussion or voting round.
+
+        Args:
+            player (Player): The player to prompt
+            alive_players (list): List of alive players
+            phase_type (str): Type of phase (day_discussion or day_voting)
+            game_state (str): Game state followed by the round's instruction
+            history (str): Discussion history to show the player
+
+        Returns:
+            tuple: (static_prefix, dynamic_suffix) prompt parts.
+        """
+        # Remind the Doctor and Mafia not to use their night actions by day
+        day_warnings = DAY_ROLE_WARNINGS.get(player.role)
+        if day_warnings:
+            game_state += day_warnings.get(player.language, day_warnings["English"])
+
+        # Add voting reminder for all players during voting phase
+        if phase_type == "day_voting":
+            game_state += VOTING_REMINDERS.get(
+                player.language, VOTING_REMINDERS["English"]
             )
 
-            # Parse vote if in voting round
-            if collect_votes and votes is not None:
-                vote_target = player.parse_day_vote(response, alive_players)
-                if vote_target:
-                    votes[player.model_name] = vote_target.model_name
-                    action_text = f"Vote {vote_target.player_name}"
-                    self.current_round_data["actions"][player.model_name] = action_text
-                    self.logger.player_action(
-                        player.model_name,
-                        player.role.value,
-                        action_text,
-                        player.player_name,
-                    )
-                else:
-                    self.logger.warning(
-                        f"{player.model_name} failed to cast a valid vote during voting phase"
-                    )
-                    self.current_round_data["actions"][
-                        player.model_name
-                    ] = "Invalid vote"
+        return player.generate_prompt_parts(
+            game_state,
+            alive_players,
+            self.mafia_players if player.role == Role.MAFIA else None,
+            history,
+        )
+
+    def _record_day_response(
+        self,
+        player,
+        response,
+        alive_players,
+        phase_type,
+        collect_votes=False,
+        votes=None,
+    ):
+        """
+        Log a player's day response, record it and parse their vote.
+
+        Args:
+            player (Player): The player who responded
+            response (str): The player's response
+            alive_players (list): List of alive players
+            phase_type (str): Type of phase (day_discussion or day_voting)
+            collect_votes (bool): Whether to collect votes in this round
+            votes (dict): Dictionary to store votes if collect_votes is True
+        """
+        self.logger.player_response(
+            player.model_name, player.role.value, response, player.player_name
+        )
+
+        # Add to messages
+        self.current_round_data["messages"].append(
+            {
+                "speaker": player.model_name,
+                "content": response,
+                "phase": phase_type,
+                "role": player.role.value,
+                "player_name": player.player_name,
+            }
+        )
+
+        # Parse vote if in voting round
+        if collect_votes and votes is not None:
+            vote_target = player.parse_day_vote(response, alive_players)
+            if vote_target:
+                votes[player.model_name] = vote_target.model_name
+                action_text = f"Vote {vote_target.player_name}"
+                self.current_round_data["actions"][player.model_name] = action_text
+                self.logger.player_action(
+                    player.model_name,
+                    player.role.value,
+                    action_text,
+                    player.player_name,
+                )
+            else:
+                self.logger.warning(
+                    f"{player.model_name} failed to cast a valid vote during voting phase"
+                )
+                self.current_round_data["actions"][
+                    player.model_name
+                ] = "Invalid vote"
 
-            # Update discussion history
-            self.discussion_history += f"{player.player_name}: {response}\n\n"
+        # Update discussion history
+        self._add_to_history(player.player_name, response)
+
+    def _get_responses(self, players_and_prompts, semantic_scopes=None, phase=None):
+        """
+        Query several players concurrently.
+
+        Args:
+            players_and_prompts (list): List of (player, system_prompt, prompt)
+                tuples; system_prompt is the static prompt prefix or None.
+            semantic_scopes (list, optional): Per-request semantic cache scopes,
+                for prompts whose answers may be reused (see config.SEMANTIC_CACHE).
+            phase (str, optional): "night" or "day_voting" when each player
+                ends with a decision line (see config.STOP_AT_DECISION).
+
+        Returns:
+            list: The cleaned responses, in the same order as the input.
+        """
+        if semantic_scopes is None:
+            semantic_scopes = [None] * len(players_and_prompts)
+        raw_responses = get_llm_responses(
+            [
+                (
+                    player.model_name,
+                    prompt,
+                    system_prompt,
+                    scope,
+                    player.decision_pattern(phase),
+                )
+                for (player, system_prompt, prompt), scope in zip(
+                    players_and_prompts, semantic_scopes
+                )
+            ]
+        )
+        return [
+            player.process_response(prompt, response, system_prompt)
+            for (player, system_prompt, prompt), response in zip(
+                players_and_prompts, raw_responses
+            )
+        ]
 
     def get_last_words(self, player, vote_count):
         """
@@ -720,8 +875,8 @@ class MafiaGame:
         )
 
         # Generate prompt for last words
-        game_state = f"{self.get_game_state()} You have been voted out with {vote_count} votes and will be eliminated. Share your final thoughts before leaving the game."
-        prompt = player.generate_prompt(
+        game_state = f"{self.get_game_state()} {LAST_WORDS_INSTRUCTION.format(vote_count=vote_count)}"
+        system_prompt, prompt = player.generate_prompt_parts(
             game_state,
             self.get_alive_players(),
             self.mafia_players if player.role == Role.MAFIA else None,
@@ -729,7 +884,7 @@ class MafiaGame:
         )
 
         # Get response
-        response = player.get_response(prompt)
+        response = player.get_response(prompt, system_prompt)
         self.logger.player_response(
             player.model_name,
             f"{player.role.value} (Last Words)",
@@ -762,19 +917,47 @@ class MafiaGame:
         # Collect votes
         confirmation_votes = {"agree": [], "disagree": []}
 
-        for player in voting_players:
-            # Prepare game state for the player
-            game_state_str = self.get_game_state()
-            # Create a dictionary with the game state and the player to eliminate
-            player_state = {
-                "game_state": game_state_str,
-                "confirmation_vote_for": player_to_eliminate.player_name,
-                "confirmation_vote_for_model": player_to_eliminate.model_name,
-            }
+        # Prepare game state for the players
+        game_state_str = self.get_game_state()
+        # Create a dictionary with the game state and the player to eliminate
+        player_state = {
+            "game_state": game_state_str,
+            "confirmation_vote_for": player_to_eliminate.player_name,
+            "confirmation_vote_for_model": player_to_eliminate.model_name,
+        }
+
+        votes = None
+        if config.BATCH_CONFIRMATION:
+            votes = self._get_batched_confirmation_votes(
+                player_to_eliminate, voting_players, game_state_str
+            )
 
-            # Get player's vote
-            vote = player.get_confirmation_vote(player_state)
+        if votes is None:
+            # Votes are independent of each other, so collect them concurrently
+            # A voter facing the same candidate in a near-identical state of
+            # this game may reuse their earlier answer when the semantic cache
+            # is enabled; scopes never span games, whose player names repeat
+            responses = self._get_responses(
+                [
+                    (player, None, player.generate_confirmation_vote_prompt(player_state))
+                    for player in voting_players
+                ],
+                semantic_scopes=[
+                    (
+                        "confirmation_vote",
+                        self.game_id,
+                        player.player_name,
+                        player_to_eliminate.player_name,
+                    )
+                    for player in voting_players
+                ],
+            )
+            votes = [
+                player.parse_confirmation_vote(response)
+                for player, response in zip(voting_players, responses)
+            ]
 
+        for player, vote in zip(voting_players, votes):
             # Validate and record vote
             if vote.lower() in ["agree", "yes", "confirm", "true"]:
                 confirmation_votes["agree"].append(player.model_name)
@@ -794,12 +977,92 @@ class MafiaGame:
 
         return is_confirmed, confirmation_votes
 
-    def run_game(self):
+    def _get_batched_confirmation_votes(
+        self, player_to_eliminate, voting_players, game_state_str
+    ):
+        """
+        Collect confirmation votes with one LLM call per model.
+
+        Voters are grouped by model and each model answers for its own voters
+        only, so every recorded vote still comes from that player's model. The
+        batch prompt is English-only; other languages use per-player prompts.
+
+        Args:
+            player_to_eliminate (Player): The player proposed for elimination
+            voting_players (list): The players casting a confirmation vote
+            game_state_str (str): The current game state
+
+        Returns:
+            list or None: "agree" or "disagree" per voting player, in order, or
+                None if batching does not apply or a response could not be
+                parsed for every voter.
+        """
+        if self.language != "English":
+            return None
+
+        voters_by_model = defaultdict(list)
+        for player in voting_players:
+            voters_by_model[player.model_name].append(player)
+        if len(voters_by_model) == len(voting_players):
+            # No model has two voters, so batching saves no calls
+            return None
+
+        requests = []
+        for model_name, players in voters_by_model.items():
+            voters = []
+            for player in players:
+                knowledge = f"- {player.player_name}: {player.role.value}"
+                if player.role == Role.MAFIA:
+                    teammates = [
+                        p.player_name for p in self.mafia_players if p is not player
+                    ]
+                    if teammates:
+                        knowledge += f" (teammates: {', '.join(teammates)})"
+                voters.append(knowledge)
+            example = orjson.dumps(
+                {player.player_name: "agree" for player in players[:2]}
+            ).decode()
+            prompt = BATCH_CONFIRMATION_TEMPLATE.format(
+                player_to_eliminate=player_to_eliminate.player_name,
+                game_state_str=game_state_str,
+                voters="\n".join(voters),
+                example=example,
+            )
+            requests.append((model_name, prompt))
+
+        votes_by_player = {}
+        responses = get_llm_responses(requests)
+        for players, response in zip(voters_by_model.values(), responses):
+            batch = None
+            json_text = _extract_json_object(response)
+            if not response.startswith("ERROR:") and json_text:
+                try:
+                    batch = orjson.loads(json_text)
+                except orjson.JSONDecodeError:
+                    pass
+            # Each model only answers for its own voters
+            for player in players:
+                votes_by_player[player] = (
+                    batch.get(player.player_name) if isinstance(batch, dict) else None
+                )
+
+        votes = [votes_by_player[player] for player in voting_players]
+        if not all(isinstance(vote, str) for vote in votes):
+            self.logger.warning("Batched confirmation vote failed; asking each voter")
+            return None
+        return [vote.strip().lower() for vote in votes]
+
+    def run_game(self, defer_critic_review=False):
         """
         Run the Mafia game until completion.
 
+        Args:
+            defer_critic_review (bool, optional): Return the critic review as a
+                concurrent.futures.Future instead of waiting for it, so the
+                caller can move on while the critic model answers.
+
         Returns:
-            tuple: (winner, rounds_data, participants, language) where winner is "Mafia" or "Villagers".
+            tuple: (winner, rounds_data, participants, language, critic_review) where winner is "Mafia" or "Villagers".
                    rounds_data includes all messages (day and night phases) for game details,
                    but players only see day phase messages during the game.
                    language is the language used for the game.
@@ -843,7 +1106,10 @@ class MafiaGame:
             }
 
         # Generate game critic review
-        critic_review = self.generate_critic_review(winner)
+        if defer_critic_review:
+            critic_review = self.start_critic_review(winner)
+        else:
+            critic_review = self.generate_critic_review(winner)
 
         # Log game end
         self.logger.game_end(1, winner, self.round_number)
@@ -860,6 +1126,33 @@ class MafiaGame:
         Returns:
             dict: A dictionary containing the critic review with title, content, and one-sentence summary.
         """
+        return self.start_critic_review(winner).result()
+
+    def start_critic_review(self, winner):
+        """
+        Start generating a game critic review without waiting for the critic.
+
+        The prompt is built from the game right away, so the game may be reset
+        or reused before the review arrives.
+
+        Args:
+            winner (str): The winning team ("Mafia" or "Villagers").
+
+        Returns:
+            concurrent.futures.Future: Resolves to the review dictionary
+                returned by generate_critic_review.
+        """
+        if not config.GENERATE_CRITIC_REVIEW:
+            review = concurrent.futures.Future()
+            review.set_result(
+                {
+                    "title": "Game Review Skipped",
+                    "content": f"The {winner} won after {self.round_number} rounds. Critic reviews are turned off for this run.",
+                    "one_liner": f"{winner} take it in round {self.round_number}.",
+                }
+            )
+            return review
+
         # Get the game summary information
         game_summary = {
             "winner": winner,
@@ -904,9 +1197,30 @@ Your tone should be professional but entertaining, like a game critic. Be specif
 Format your response as a JSON object with 'title', 'content', and 'one_liner' fields.
 """
 
+        review = concurrent.futures.Future()
+        # Each game gets exactly one review, so the semantic cache could never
+        # hit here; leaving it out spares an embedding per game
+        response = submit_llm_response(config.CRITIC_MODEL, prompt)
+        response.add_done_callback(
+            lambda finished: review.set_result(
+                self._critic_review_from_response(finished)
+            )
+        )
+        return review
+
+    @staticmethod
+    def _critic_review_from_response(response):
+        """
+        Turn the critic model's reply into a review.
+
+        Args:
+            response (concurrent.futures.Future): The finished critic request.
+
+        Returns:
+            dict: A dictionary containing the critic review with title, content, and one-sentence summary.
+        """
         try:
-            model_name = config.CRITIC_MODEL
-            response_content = get_llm_response(model_name, prompt)
+            response_content = response.result()
 
             if response_content.startswith("ERROR:"):
                 return {
@@ -916,18 +1230,18 @@ Format your response as a JSON object with 'title', 'content', and 'one_liner' f
                 }
 
             # Look for JSON in the response
-            json_match = re.search(r"({.*})", response_content, re.DOTALL)
+            json_text = _extract_json_object(response_content)
 
-            if json_match:
+            if json_text:
                 try:
-                    review_json = json.loads(json_match.group(1))
+                    review_json = orjson.loads(json_text)
                     # Ensure one_liner exists
                     if "one_liner" not in review_json:
                         review_json["one_liner"] = (
                             "A game that defies simple description!"
                         )
                     return review_json
-                except json.JSONDecodeError:
+                except orjson.JSONDecodeError:
                     # Fallback if JSON parsing fails
                     return {
                         "title": "AI Mafia Game Review",
@@ -89,7 +89,6 @@ You are {model_name}, playing a Mafia game as a Mafia member. Your PRIMARY goal
 
 Other Mafia members: {mafia_members}
 All players: {player_names}
-Current game state: {game_state}
 
 {thinking_tag}
 
@@ -99,10 +98,6 @@ IMPORTANT INSTRUCTIONS:
 - During DAY phase: DO NOT use "ACTION: Kill" as it will reveal your identity as Mafia!
 - During DAY phase: Act like a villager and convince others you're innocent
 - During DAY phase: End your message with your vote using format: VOTE: [player]
-
-Previous discussion: {discussion_history}
-
-Your response:
 """,
         Role.DOCTOR: """
 You are {model_name}, playing a Mafia game as the Doctor. Your PRIMARY goal is to help the Villagers WIN the game.
@@ -110,7 +105,6 @@ You are {model_name}, playing a Mafia game as the Doctor. Your PRIMARY goal is t
 {game_rules}
 
 All players: {player_names}
-Current game state: {game_state}
 
 {thinking_tag}
 
@@ -120,10 +114,6 @@ IMPORTANT INSTRUCTIONS:
 - You MUST end your night message with: ACTION: Protect [player]
 - During DAY phase: DO NOT use the "Protect" action
 - During DAY phase: End your message with your vote using format: VOTE: [player]
-
-Previous discussion: {discussion_history}
-
-Your response:
 """,
         Role.VILLAGER: """
 You are {model_name}, playing a Mafia game as a Villager. Your PRIMARY goal is to WIN the game.
@@ -131,7 +121,6 @@ You are {model_name}, playing a Mafia game as a Villager. Your PRIMARY goal is t
 {game_rules}
 
 All players: {player_names}
-Current game state: {game_state}
 
 {thinking_tag}
 
@@ -140,10 +129,6 @@ IMPORTANT INSTRUCTIONS:
 - During DAY DISCUSSION phase: Work to identify the Mafia members
 - During DAY VOTING phase: You MUST vote to eliminate a suspected Mafia member
 - During DAY VOTING phase: End your message with your vote using format: VOTE: [player]
-
-Previous discussion: {discussion_history}
-
-Your response:
 """,
     },
     "Spanish": {
@@ -154,7 +139,6 @@ Eres {model_name}, jugando un juego de Mafia como miembro de la Mafia. Tu objeti
 
 Otros miembros de la Mafia: {mafia_members}
 Todos los jugadores: {player_names}
-Estado actual del juego: {game_state}
 
 {thinking_tag}
 
@@ -164,10 +148,6 @@ INSTRUCCIONES IMPORTANTES:
 - Durante la fase DIURNA: ¡NO uses "ACCIÓN: Matar" ya que revelará tu identidad como Mafia!
 - Durante la fase DIURNA: Actúa como un aldeano y convence a los demás de que eres inocente
 - Durante la fase DIURNA: Termina tu mensaje con tu voto usando el formato: VOTO: [jugador]
-
-Discusión previa: {discussion_history}
-
-Tu respuesta:
 """,
         Role.DOCTOR: """
 Eres {model_name}, jugando un juego de Mafia como el Doctor. Tu objetivo PRINCIPAL es ayudar a los aldeanos a GANAR el juego.
@@ -175,7 +155,6 @@ Eres {model_name}, jugando un juego de Mafia como el Doctor. Tu objetivo PRINCIP
 {game_rules}
 
 Todos los jugadores: {player_names}
-Estado actual del juego: {game_state}
 
 {thinking_tag}
 
@@ -185,10 +164,6 @@ INSTRUCCIONES IMPORTANTES:
 - DEBES terminar tu mensaje nocturno con: ACCIÓN: Proteger [jugador]
 - Durante la fase DIURNA: NO uses la acción "Proteger"
 - Durante la fase DIURNA: Termina tu mensaje con tu voto usando el formato: VOTO: [jugador]
-
-Discusión previa: {discussion_history}
-
-Tu respuesta:
 """,
         Role.VILLAGER: """
 Eres {model_name}, jugando un juego de Mafia como Aldeano. Tu objetivo PRINCIPAL es GANAR el juego.
@@ -196,7 +171,6 @@ Eres {model_name}, jugando un juego de Mafia como Aldeano. Tu objetivo PRINCIPAL
 {game_rules}
 
 Todos los jugadores: {player_names}
-Estado actual del juego: {game_state}
 
 {thinking_tag}
 
@@ -205,10 +179,6 @@ INSTRUCCIONES IMPORTANTES:
 - Durante la fase de DISCUSIÓN DIURNA: Trabaja para identificar a los miembros de la Mafia
 - Durante la fase de VOTACIÓN DIURNA: DEBES votar para eliminar a un miembro sospechoso de la Mafia
 - Durante la fase de VOTACIÓN DIURNA: Termina tu mensaje con tu voto usando el formato: VOTO: [jugador]
-
-Discusión previa: {discussion_history}
-
-Tu respuesta:
 """,
     },
     "French": {
@@ -219,7 +189,6 @@ Vous êtes {model_name}, jouant à un jeu de Mafia en tant que membre de la Mafi
 
 Autres membres de la Mafia: {mafia_members}
 Tous les joueurs: {player_names}
-État actuel du jeu: {game_state}
 
 {thinking_tag}
 
@@ -229,10 +198,6 @@ INSTRUCTIONS IMPORTANTES:
 - Pendant la phase de JOUR: N'utilisez PAS "ACTION: Tuer" car cela révélerait votre identité en tant que Mafia!
 - Pendant la phase de JOUR: Agissez comme un villageois et convainquez les autres que vous êtes innocent
 - Pendant la phase de JOUR: Terminez votre message avec votre vote en utilisant le format: VOTE: [joueur]
-
-Discussion précédente: {discussion_history}
-
-Votre réponse:
 """,
         Role.DOCTOR: """
 Vous êtes {model_name}, jouant à un jeu de Mafia en tant que Docteur. Votre objectif PRINCIPAL est d'aider les villageois à GAGNER la partie.
@@ -240,7 +205,6 @@ Vous êtes {model_name}, jouant à un jeu de Mafia en tant que Docteur. Votre ob
 {game_rules}
 
 Tous les joueurs: {player_names}
-État actuel du jeu: {game_state}
 
 {thinking_tag}
 
@@ -250,10 +214,6 @@ INSTRUCTIONS IMPORTANTES:
 - Vous DEVEZ terminer votre message de nuit par: ACTION: Protéger [joueur]
 - Pendant la phase de JOUR: N'utilisez PAS l'action "Protéger"
 - Pendant la phase de JOUR: Terminez votre message par votre vote en utilisant le format: VOTE: [joueur]
-
-Discussion précédente: {discussion_history}
-
-Votre réponse:
 """,
         Role.VILLAGER: """
 Vous êtes {model_name}, jouant à un jeu de Mafia en tant que Villageois. Votre objectif PRINCIPAL est de GAGNER la partie.
@@ -261,7 +221,6 @@ Vous êtes {model_name}, jouant à un jeu de Mafia en tant que Villageois. Votre
 {game_rules}
 
 Tous les joueurs: {player_names}
-État actuel du jeu: {game_state}
 
 {thinking_tag}
 
@@ -270,10 +229,6 @@ INSTRUCTIONS IMPORTANTES:
 - Pendant la phase de DISCUSSION de JOUR: Travaillez à identifier les membres de la Mafia
 - Pendant la phase de VOTE de JOUR: Vous DEVEZ voter pour éliminer un membre suspecté de la Mafia
 - Pendant la phase de VOTE de JOUR: Terminez votre message par votre vote en utilisant le format: VOTE: [joueur]
-
-Discussion précédente: {discussion_history}
-
-Votre réponse:
 """,
     },
     "Korean": {
@@ -284,7 +239,6 @@ Votre réponse:
 
 다른 마피아 멤버: {mafia_members}
 모든 플레이어: {player_names}
-현재 게임 상태: {game_state}
 
 {thinking_tag}
 
@@ -294,10 +248,6 @@ Votre réponse:
 - 낮 단계에서: "행동: 죽이기"를 사용하지 마세요. 이는 당신이 마피아임을 드러낼 것입니다!
 - 낮 단계에서: 마을 사람처럼 행동하고 다른 사람들에게 당신이 무고하다고 설득하세요
 - 낮 단계에서: 메시지 끝에 투표를 포함하세요. 형식 사용: 투표: [플레이어]
-
-이전 토론: {discussion_history}
-
-당신의 응답:
 """,
         Role.DOCTOR: """
 당신은 {model_name}이며, 의사로서 마피아 게임을 하고 있습니다. 당신의 주요 목표는 마을 사람들이 승리하도록 돕는 것입니다.
@@ -305,7 +255,6 @@ Votre réponse:
 {game_rules}
 
 모든 플레이어: {player_names}
-현재 게임 상태: {game_state}
 
 {thinking_tag}
 
@@ -315,10 +264,6 @@ Votre réponse:
 - 밤 메시지 끝에 반드시 다음 형식을 사용하세요: 행동: 보호하기 [플레이어]
 - 낮 단계에서는: "보호하기" 행동을 사용하지 마세요
 - 낮 단계에서는: 메시지 끝에 다음 형식으로 투표하세요: 투표: [플레이어]
-
-이전 토론: {discussion_history}
-
-당신의 응답:
 """,
         Role.VILLAGER: """
 당신은 {model_name}이며, 마을 사람으로서 마피아 게임을 하고 있습니다. 당신의 주요 목표는 게임에서 승리하는 것입니다.
@@ -326,7 +271,6 @@ Votre réponse:
 {game_rules}
 
 모든 플레이어: {player_names}
-현재 게임 상태: {game_state}
 
 {thinking_tag}
 
@@ -335,12 +279,41 @@ Votre réponse:
 - 낮 토론 단계에서: 마피아 구성원을 식별하기 위해 노력하세요
 - 낮 투표 단계에서: 반드시 의심되는 마피아 구성원을 제거하기 위해 투표해야 합니다
 - 낮 투표 단계에서: 메시지 끝에 다음 형식으로 투표하세요: 투표: [플레이어]
+""",
+    },
+}
+
+# Per-turn part of every role prompt, sent after the static PROMPT_TEMPLATES
+# prefix so that providers can cache the prefix across a player's calls
+PROMPT_SUFFIX_TEMPLATES = {
+    "English": """
+Current game state: {game_state}
+
+Previous discussion: {discussion_history}
+
+Your response:
+""",
+    "Spanish": """
+Estado actual del juego: {game_state}
+
+Discusión previa: {discussion_history}
+
+Tu respuesta:
+""",
+    "French": """
+État actuel du jeu: {game_state}
+
+Discussion précédente: {discussion_history}
+
+Votre réponse:
+""",
+    "Korean": """
+현재 게임 상태: {game_state}
 
 이전 토론: {discussion_history}
 
 당신의 응답:
 """,
-    },
 }
 
 # Constants for confirmation vote templates
@@ -407,6 +380,59 @@ Votre réponse:
 """,
 }
 
+# Single prompt that collects every confirmation vote at once (see config.BATCH_CONFIRMATION)
+BATCH_CONFIRMATION_TEMPLATE = """
+You are moderating a Mafia game. The town has voted to eliminate {player_to_eliminate}.
+Before the elimination is carried out, every other living player casts a confirmation vote.
+
+Current game state: {game_state_str}
+
+Voters, with what each of them knows:
+{voters}
+
+For each voter, decide whether they would agree with eliminating {player_to_eliminate}, playing in the interest of their own team.
+Respond ONLY with a JSON object mapping every voter's name to "agree" or "disagree", for example: {example}
+"""
+
+# Per-phase instructions appended to the game state in player prompts
+MAFIA_NIGHT_INSTRUCTION = "It's night time (Round {round_number}). As the Mafia, you MUST choose exactly one player to kill tonight. You cannot skip this action. End your response with ACTION: Kill [player]."
+
+DOCTOR_NIGHT_INSTRUCTIONS = {
+    "English": "It's night time (Round {round_number}). As the Doctor, you MUST choose exactly one player to protect from the Mafia tonight. You cannot skip this action. End your response with ACTION: Protect [player].",
+    "Spanish": "Es hora de noche (Ronda {round_number}). Como Doctor, DEBES elegir exactamente a un jugador para proteger de la Mafia esta noche. No puedes omitir esta acción. Termina tu respuesta con ACCIÓN: Proteger [jugador].",
+    "French": "C'est la nuit (Tour {round_number}). En tant que Docteur, vous DEVEZ choisir exactement un joueur à protéger de la Mafia ce soir. Vous ne pouvez pas ignorer cette action. Terminez votre réponse par ACTION: Protéger [joueur].",
+    "Korean": "밤 시간입니다 (라운드 {round_number}). 의사로서, 당신은 오늘 밤 마피아로부터 보호할 플레이어를 정확히 한 명 선택해야 합니다. 이 행동을 건너뛸 수 없습니다. 응답 끝에 행동: 보호하기 [플레이어]를 포함하세요.",
+}
+
+DAY_DISCUSSION_INSTRUCTION = "It's day time (Round {round_number}). Discuss with other players about who might be Mafia. This is the DISCUSSION PHASE ONLY - DO NOT VOTE YET. You will vote in the next round."
+
+DAY_VOTING_INSTRUCTION = "It's now the VOTING PHASE (Round {round_number}). Make your final arguments and YOU MUST VOTE to eliminate a suspected Mafia member. End your message with VOTE: [player name]."
+
+LAST_WORDS_INSTRUCTION = "You have been voted out with {vote_count} votes and will be eliminated. Share your final thoughts before leaving the game."
+
+# Day-phase reminders for roles whose night action must not be repeated
+DAY_ROLE_WARNINGS = {
+    Role.DOCTOR: {
+        "English": " IMPORTANT: This is the DAY phase. Do NOT use your protection ability now. Only use ACTION: Protect during night phase.",
+        "Spanish": " IMPORTANTE: Esta es la fase DIURNA. NO uses tu habilidad de protección ahora. Solo usa ACCIÓN: Proteger durante la fase nocturna.",
+        "French": " IMPORTANT: C'est la phase de JOUR. N'utilisez PAS votre capacité de protection maintenant. Utilisez ACTION: Protéger uniquement pendant la phase de nuit.",
+        "Korean": " 중요: 지금은 낮 단계입니다. 지금은 보호 능력을 사용하지 마세요. 행동: 보호하기는 밤 단계에서만 사용하세요.",
+    },
+    Role.MAFIA: {
+        "English": " IMPORTANT: This is the DAY phase. Do NOT use 'ACTION: Kill' now. Instead, use 'VOTE: [player]' to vote like other villagers.",
+        "Spanish": " IMPORTANTE: Esta es la fase DIURNA. NO uses 'ACCIÓN: Matar' ahora. En su lugar, usa 'VOTO: [jugador]' para votar como los demás aldeanos.",
+        "French": " IMPORTANT: C'est la phase de JOUR. N'utilisez PAS 'ACTION: Tuer' maintenant. À la place, utilisez 'VOTE: [joueur]' pour voter comme les autres villageois.",
+        "Korean": " 중요: 지금은 낮 단계입니다. '행동: 죽이기'를 사용하지 마세요. 대신 다른 마을 사람들처럼 '투표: [플레이어]'를 사용하여 투표하세요.",
+    },
+}
+
+VOTING_REMINDERS = {
+    "English": " REMINDER: This is the VOTING PHASE. You MUST end your message with 'VOTE: [player]' to cast your vote.",
+    "Spanish": " RECORDATORIO: Esta es la fase de VOTACIÓN. DEBES terminar tu mensaje con 'VOTO: [jugador]' para emitir tu voto.",
+    "French": " RAPPEL: C'est la phase de VOTE. Vous DEVEZ terminer votre message par 'VOTE: [joueur]' pour exprimer votre vote.",
+    "Korean": " 알림: 지금은 투표 단계입니다. 반드시 메시지 끝에 '투표: [플레이어]'를 포함하여 투표해야 합니다.",
+}
+
 # Constants for thinking tags
 THINKING_TAGS = {
     "English": f"IMPORTANT: You can use <think>your private thoughts here</think> tags to reason privately. \nOther players will NOT see anything inside these tags. Use this to plan your strategy.\nYour response is limited to {config.MAX_OUTPUT_TOKENS} tokens maximum. Be concise and focused.",
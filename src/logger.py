@@ -3,11 +3,19 @@ Logger for the LLM Mafia Game Competition.
 Provides colorful and formatted logging for the game simulation.
 """
 
+import atexit
+import logging
 import os
+import queue
+import sys
+import threading
 from enum import Enum
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
 import time
 
+import config
+
 
 class Color(Enum):
     """ANSI color codes for terminal output."""
@@ -47,22 +55,103 @@ class Color(Enum):
     BRIGHT_WHITE = "\033[97m"
 
 
+# Console output is handed to a queue and written to stdout by a single
+# listener thread, so game and worker threads never block on the stream.
+_console_logger = logging.getLogger("mafia")
+_console_listener = None
+_console_lock = threading.Lock()
+
+
+def _start_console_listener():
+    """Attach the queue handler to the "mafia" logger on first use."""
+    global _console_listener
+    with _console_lock:
+        if _console_listener is not None:
+            return
+        log_queue = queue.SimpleQueue()
+        _console_listener = QueueListener(log_queue, logging.StreamHandler(sys.stdout))
+        _console_listener.start()
+        atexit.register(_console_listener.stop)
+        _console_logger.addHandler(QueueHandler(log_queue))
+        _console_logger.setLevel(config.LOG_LEVEL)
+        _console_logger.propagate = False
+
+
+# Log file lines go through a queue as well. A single writer thread writes
+# them and flushes every file it touched once it has caught up.
+_file_queue = queue.SimpleQueue()
+_file_writer = None
+
+
+def _write_log_files():
+    """Drain queued (file, text) items; text None closes the file."""
+    dirty = set()
+    while True:
+        try:
+            item = _file_queue.get(block=not dirty)
+        except queue.Empty:
+            for log_file in dirty:
+                log_file.flush()
+            dirty.clear()
+            continue
+        if item is None:
+            for log_file in dirty:
+                log_file.flush()
+            return
+        log_file, text = item
+        if text is None:
+            log_file.close()
+            dirty.discard(log_file)
+        else:
+            log_file.write(text)
+            dirty.add(log_file)
+
+
+def _stop_file_writer():
+    """Write out everything still queued before the interpreter exits."""
+    _file_queue.put(None)
+    _file_writer.join()
+
+
+def _start_file_writer():
+    """Start the log file writer thread on first use."""
+    global _file_writer
+    with _console_lock:
+        if _file_writer is not None:
+            return
+        _file_writer = threading.Thread(
+            target=_write_log_files, name="log-file-writer", daemon=True
+        )
+        _file_writer.start()
+        atexit.register(_stop_file_writer)
+
+
 class GameLogger:
     """Logger for the Mafia game simulation."""
 
     # Make Color accessible as a class attribute
     Color = Color
 
-    def __init__(self, log_to_file=True, log_dir="logs"):
+    def __init__(self, log_to_file=True, log_dir="logs", name="mafia", log_id=None):
         """
         Initialize the game logger.
 
         Args:
             log_to_file (bool): Whether to log to a file in addition to console.
             log_dir (str): Directory to store log files.
+            name (str): Name of the underlying ``logging`` logger; levels are
+                inherited from the "mafia" logger.
+            log_id (str, optional): Appended to the log file name, e.g. a game ID.
         """
+        _start_console_listener()
         self.log_to_file = log_to_file
+        self.log_dir = log_dir
+        # The file at log_path is created on the first write, so a logger
+        # that never writes leaves no empty file behind
+        self.log_path = None
         self.log_file = None
+        self._log_file_lock = threading.Lock()
+        self.logger = logging.getLogger(name)
 
         # Role colors
         self.role_colors = {
@@ -78,28 +167,53 @@ class GameLogger:
             "day": Color.BRIGHT_YELLOW,
         }
 
-        # Create log directory if needed
         if log_to_file:
-            os.makedirs(log_dir, exist_ok=True)
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            self.log_file = open(f"{log_dir}/mafia_game_{timestamp}.log", "w")
+            _start_file_writer()
+            self.open_log_file(log_id)
+
+    def open_log_file(self, log_id=None):
+        """
+        Close the current log file and continue logging to a new one.
+
+        The new file is only created once something is written to it.
+
+        Args:
+            log_id (str, optional): Appended to the log file name, e.g. a game ID.
+        """
+        if not self.log_to_file:
+            return
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        suffix = f"_{log_id}" if log_id else ""
+        with self._log_file_lock:
+            self._close_log_file()
+            self.log_path = f"{self.log_dir}/mafia_game_{timestamp}{suffix}.log"
+
+    def _close_log_file(self):
+        if self.log_file:
+            # Closed by the writer thread, after any lines still queued
+            _file_queue.put((self.log_file, None))
+            self.log_file = None
 
     def __del__(self):
         """Close log file when logger is destroyed."""
-        if self.log_file:
-            self.log_file.close()
+        self._close_log_file()
 
     def _write_to_file(self, text):
-        """Write plain text to log file."""
-        if self.log_to_file and self.log_file:
-            # Remove ANSI color codes for file logging
-            clean_text = text
-            for color in Color:
-                clean_text = clean_text.replace(color.value, "")
-            self.log_file.write(clean_text + "\n")
-            self.log_file.flush()
-
-    def print(self, text, color=None, bold=False, underline=False):
+        """Queue plain text for the log file."""
+        if not (self.log_to_file and self.log_path):
+            return
+        with self._log_file_lock:
+            if self.log_file is None:
+                os.makedirs(self.log_dir, exist_ok=True)
+                self.log_file = open(self.log_path, "w")
+            log_file = self.log_file
+        # Remove ANSI color codes for file logging
+        clean_text = text
+        for color in Color:
+            clean_text = clean_text.replace(color.value, "")
+        _file_queue.put((log_file, clean_text + "\n"))
+
+    def print(self, text, color=None, bold=False, underline=False, level=logging.INFO):
         """
         Print colored text to console and log file.
 
@@ -108,7 +222,13 @@ class GameLogger:
             color (Color, optional): Color to use.
             bold (bool, optional): Whether to make text bold.
             underline (bool, optional): Whether to underline text.
+            level (int, optional): Logging level; messages below LOG_LEVEL
+                are kept off the console but still written to the log file.
         """
+        to_console = self.logger.isEnabledFor(level)
+        if not (to_console or (self.log_to_file and self.log_path)):
+            return
+
         formatted_text = text
 
         if color:
@@ -123,7 +243,8 @@ class GameLogger:
         if color or bold or underline:
             formatted_text = f"{formatted_text}{Color.RESET.value}"
 
-        print(formatted_text)
+        if to_console:
+            self.logger.log(level, formatted_text)
         self._write_to_file(formatted_text)
 
     def header(self, text, color=Color.CYAN):
@@ -221,11 +342,11 @@ class GameLogger:
 
     def error(self, text):
         """Log an error message."""
-        self.print(f"ERROR: {text}", Color.RED, bold=True)
+        self.print(f"ERROR: {text}", Color.RED, bold=True, level=logging.ERROR)
 
     def warning(self, text):
         """Log a warning message."""
-        self.print(f"WARNING: {text}", Color.YELLOW, bold=True)
+        self.print(f"WARNING: {text}", Color.YELLOW, bold=True, level=logging.WARNING)
 
     def log_model_issue(self, model_name, issue_type, details):
         """
@@ -245,7 +366,7 @@ class GameLogger:
         )
 
         # Print to console
-        self.print(log_message, Color.BRIGHT_YELLOW, bold=True)
+        self.print(log_message, Color.BRIGHT_YELLOW, bold=True, level=logging.WARNING)
 
         # Also log to a model-specific log file
         model_short_name = model_name.split("/")[-1].replace(":", "_")
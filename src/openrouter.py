@@ -3,18 +3,117 @@ Unified LLM API client for the LLM Mafia Game Competition.
 This module handles interactions with both OpenRouter and Ollama APIs.
 """
 
-import json
-import time
+import asyncio
+import atexit
+import hashlib
+import random
+import re
+import threading
+from functools import lru_cache
 from typing import Any
 
+import aiohttp
+import orjson
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
 import config
 from logger import GameLogger
 
 # Create a logger instance for model-specific issues
 model_logger = GameLogger(log_to_file=True)
 OPENROUTER_API_ROOT = "https://openrouter.ai/api/v1"
-OPENROUTER_RETRY_STATUSES = {408, 429, 500, 502, 503, 504}
+OPENROUTER_RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+OPENROUTER_BACKOFF_FACTOR = 0.5
+OPENROUTER_MAX_BACKOFF = 30
+# A timed-out request is retried once with this much more time
+OPENROUTER_TIMEOUT_RETRY_FACTOR = 1.5
+OPENROUTER_CONNECTION_LIMIT = 64
+OPENROUTER_CONNECTION_LIMIT_PER_HOST = 32
+# Models that only cache prompt prefixes marked with cache_control
+OPENROUTER_EXPLICIT_CACHE_PREFIXES = ("anthropic/",)
+
+# Private <think> blocks, which never hold a player's actual decision
+_THINK_RE = re.compile(r"<think>.*?</think>", re.DOTALL | re.IGNORECASE)
+_THINK_OPEN_RE = re.compile(r"<think>.*$", re.DOTALL | re.IGNORECASE)
+
+# Keep-alive connection pool for the remaining synchronous requests
+# (Ollama and the OpenRouter key/credits endpoints). Only idempotent methods
+# are retried (urllib3's default), so an Ollama generation is never re-run.
+_http_session = requests.Session()
+_http_adapter = HTTPAdapter(
+    pool_connections=32,
+    pool_maxsize=64,
+    max_retries=Retry(
+        total=config.API_MAX_ATTEMPTS - 1,
+        backoff_factor=OPENROUTER_BACKOFF_FACTOR,
+        status_forcelist=tuple(sorted(OPENROUTER_RETRY_STATUSES)),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    ),
+)
+_http_session.mount("https://", _http_adapter)
+_http_session.mount("http://", _http_adapter)
+OLLAMA_HEADERS = {"Content-Type": "application/json"}
+
+# Memoized responses keyed by a digest of (model, prompt); see CACHE_LLM_RESPONSES
+_response_cache: dict[bytes, str] = {}
+_response_cache_lock = threading.Lock()
+
+# On-disk response store, opened on first use; see RESPONSE_STORE_PATH
+_response_store = None
+_response_store_lock = threading.Lock()
+
+# Near-duplicate prompt cache, created on first use; see SEMANTIC_CACHE
+_semantic_cache = None
+_semantic_cache_lock = threading.Lock()
+
+# All async LLM requests run on one background event loop so that
+# synchronous callers (game threads) can share a single aiohttp session.
+_event_loop = None
+_event_loop_lock = threading.Lock()
+_aiohttp_session = None
+
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Return the background event loop, starting it on first use."""
+    global _event_loop
+    with _event_loop_lock:
+        if _event_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="llm-event-loop", daemon=True
+            ).start()
+            _event_loop = loop
+        return _event_loop
+
+
+def _run_async(coro):
+    """Run a coroutine on the background event loop and wait for its result."""
+    return asyncio.run_coroutine_threadsafe(coro, _get_event_loop()).result()
+
+
+def _get_aiohttp_session() -> aiohttp.ClientSession:
+    """Return the shared aiohttp session. Only call this on the background loop."""
+    global _aiohttp_session
+    if _aiohttp_session is None or _aiohttp_session.closed:
+        _aiohttp_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(
+                limit=OPENROUTER_CONNECTION_LIMIT,
+                limit_per_host=OPENROUTER_CONNECTION_LIMIT_PER_HOST,
+            )
+        )
+    return _aiohttp_session
+
+
+@atexit.register
+def _close_aiohttp_session():
+    """Close the shared session cleanly before the loop thread is torn down."""
+    if _event_loop is not None and _aiohttp_session is not None:
+        if not _aiohttp_session.closed:
+            asyncio.run_coroutine_threadsafe(
+                _aiohttp_session.close(), _event_loop
+            ).result(timeout=5)
 
 
 def _configured_openrouter_key(api_key: str | None = None) -> str | None:
@@ -30,12 +129,89 @@ def _openrouter_headers(api_key: str | None = None) -> dict[str, str]:
     key = _configured_openrouter_key(api_key)
     if not key:
         raise ValueError("OPENROUTER_API_KEY is not configured")
+    return _headers_for_key(key)
+
+
+@lru_cache(maxsize=8)
+def _headers_for_key(key: str) -> dict[str, str]:
+    """Build the header dict once per API key instead of on every request."""
     return {
         "Authorization": f"Bearer {key}",
         "Content-Type": "application/json",
     }
 
 
+@lru_cache(maxsize=None)
+def _client_timeout(model_name: str) -> aiohttp.ClientTimeout:
+    """Return the aiohttp timeout for a model, built once per model."""
+    return aiohttp.ClientTimeout(
+        total=config.EFFECTIVE_TIMEOUT.get(model_name, config.API_TIMEOUT)
+    )
+
+
+@lru_cache(maxsize=None)
+def _compile_stop_pattern(stop_pattern: str) -> re.Pattern:
+    """Compile a decision pattern once; the parsers match it case-insensitively."""
+    return re.compile(stop_pattern, re.IGNORECASE)
+
+
+def _decision_complete(text: str, stop_pattern: re.Pattern) -> bool:
+    """Return True once text holds a finished decision line outside <think> blocks.
+
+    The match must be followed by at least one more character, so a player
+    name still arriving in the next chunk is not cut short.
+    """
+    visible = _THINK_OPEN_RE.sub("", _THINK_RE.sub("", text))
+    match = stop_pattern.search(visible)
+    return match is not None and match.end() < len(visible)
+
+
+async def _read_until_decided(response, stop_pattern: re.Pattern) -> str:
+    """Read a streamed completion, closing the stream once the decision is made.
+
+    Returns:
+        str: The text received, which is the full completion if the model
+            never wrote a decision line.
+    """
+    text = ""
+    async for line in response.content:
+        # Skip blank event separators and ": OPENROUTER PROCESSING" comments
+        if not line.startswith(b"data: "):
+            continue
+        payload = line[6:].strip()
+        if payload == b"[DONE]":
+            break
+        chunk = orjson.loads(payload)
+        if "error" in chunk:
+            raise RuntimeError(f"stream error: {chunk['error']}")
+        choices = chunk.get("choices")
+        if not choices:
+            continue
+        delta = choices[0].get("delta", {}).get("content")
+        if delta:
+            text += delta
+            if _decision_complete(text, stop_pattern):
+                # Dropping the connection stops generation (and billing)
+                response.close()
+                break
+    return text
+
+
+def _retry_delay(attempt: int, retry_after: str | None = None) -> float:
+    """Return how long to wait before the next attempt.
+
+    Honors a numeric Retry-After header, otherwise backs off exponentially
+    with full jitter so parallel games do not retry in lockstep.
+    """
+    if retry_after:
+        try:
+            return min(max(float(retry_after), 0.0), OPENROUTER_MAX_BACKOFF)
+        except ValueError:
+            pass
+    backoff = OPENROUTER_BACKOFF_FACTOR * 2 ** (attempt - 1)
+    return random.uniform(0, min(backoff, OPENROUTER_MAX_BACKOFF))
+
+
 def is_ollama_model(model_name):
     """
     Check if a model name corresponds to an Ollama model.
@@ -49,49 +225,45 @@ def is_ollama_model(model_name):
     return model_name in config.OLLAMA_MODELS or model_name.startswith("ollama:")
 
 
-def get_ollama_response(model_name, prompt):
+def get_ollama_response(model_name, prompt, system_prompt=None):
     """
     Get a response from an LLM model using Ollama API.
 
     Args:
         model_name (str): The name of the LLM model to use.
         prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix sent as the system prompt.
 
     Returns:
         str: The response from the model.
     """
-    # Get model-specific configuration if available
-    model_config = config.MODEL_CONFIGS.get(model_name, {})
-    
-    # Set timeout based on model config or defaults
-    timeout = model_config.get("timeout", config.API_TIMEOUT)
-
-    headers = {
-        "Content-Type": "application/json",
-    }
+    timeout = config.EFFECTIVE_TIMEOUT.get(model_name, config.API_TIMEOUT)
 
     # Remove "ollama:" prefix if present
     clean_model_name = model_name.replace("ollama:", "")
 
-    data = {
+    payload = {
         "model": clean_model_name,
         "prompt": prompt,
         "stream": False,
         "options": {
             "num_predict": config.MAX_OUTPUT_TOKENS,
-        }
+        },
     }
+    if system_prompt:
+        payload["system"] = system_prompt
+    data = orjson.dumps(payload)
 
     try:
-        response = requests.post(
+        response = _http_session.post(
             config.OLLAMA_API_URL,
-            headers=headers,
-            data=json.dumps(data),
+            headers=OLLAMA_HEADERS,
+            data=data,
             timeout=timeout,
         )
         response.raise_for_status()
 
-        result = response.json()
+        result = orjson.loads(response.content)
         return result["response"]
 
     except Exception as e:
@@ -101,7 +273,7 @@ def get_ollama_response(model_name, prompt):
         # Only try to access response.text if response is defined
         try:
             if "response" in locals():
-                response_text = response.text
+                response_text = response.content[:2000].decode("utf-8", "replace")
         except:
             pass
 
@@ -111,13 +283,47 @@ def get_ollama_response(model_name, prompt):
         return "ERROR: Could not get response from Ollama"
 
 
-def get_openrouter_response(model_name, prompt):
+def _openrouter_messages(model_name, prompt, system_prompt=None):
+    """Build the chat messages, putting the static prompt prefix first.
+
+    OpenAI-style providers cache repeated prompt prefixes automatically;
+    Anthropic models only do so for blocks marked with cache_control.
     """
-    Get a response from an LLM model using OpenRouter API.
+    messages = []
+    if system_prompt:
+        if model_name.startswith(OPENROUTER_EXPLICIT_CACHE_PREFIXES):
+            messages.append(
+                {
+                    "role": "system",
+                    "content": [
+                        {
+                            "type": "text",
+                            "text": system_prompt,
+                            "cache_control": {"type": "ephemeral"},
+                        }
+                    ],
+                }
+            )
+        else:
+            messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+async def get_openrouter_response_async(
+    model_name, prompt, system_prompt=None, stop_pattern=None
+):
+    """
+    Get a response from an LLM model using OpenRouter API without blocking.
 
     Args:
         model_name (str): The name of the LLM model to use.
         prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix, sent as a
+            cacheable system message ahead of the prompt.
+        stop_pattern (str, optional): Regex for the decision line the
+            response ends with. With STOP_AT_DECISION on, the response is
+            streamed and cut off once this line is complete.
 
     Returns:
         str: The response from the model.
@@ -125,58 +331,90 @@ def get_openrouter_response(model_name, prompt):
     # Get model-specific configuration if available
     model_config = config.MODEL_CONFIGS.get(model_name, {})
 
-    # Set timeout, max_retries, and backoff_factor based on model config or defaults
-    timeout = model_config.get("timeout", config.API_TIMEOUT)
+    timeout = _client_timeout(model_name)
 
     headers = _openrouter_headers()
 
-    data = {
+    payload = {
         "model": model_name,
-        "messages": [{"role": "user", "content": prompt}],
+        "messages": _openrouter_messages(model_name, prompt, system_prompt),
         "max_tokens": config.MAX_OUTPUT_TOKENS,
     }
-
-    max_attempts = model_config.get("max_retries", 3)
+    stream = config.STOP_AT_DECISION and stop_pattern is not None
+    if stream:
+        payload["stream"] = True
+        stop_pattern = _compile_stop_pattern(stop_pattern)
+    # Encoded once; retries resend the same bytes
+    data = orjson.dumps(payload)
+
+    max_attempts = model_config.get("max_retries", config.API_MAX_ATTEMPTS)
     last_error = None
-    last_response_text = "No response received"
+    last_body = None
+    timed_out = False
+    session = _get_aiohttp_session()
 
     for attempt in range(1, max_attempts + 1):
-        response = None
+        status = None
         try:
-            response = requests.post(
+            async with session.post(
                 config.OPENROUTER_API_URL,
                 headers=headers,
-                data=json.dumps(data),
+                data=data,
                 timeout=timeout,
-            )
-
-            if response.status_code in OPENROUTER_RETRY_STATUSES and attempt < max_attempts:
-                last_response_text = response.text
-                model_logger.warning(
-                    f"Retrying OpenRouter model {model_name} after HTTP {response.status_code} "
-                    f"(attempt {attempt}/{max_attempts})"
-                )
-                time.sleep(min(2 ** (attempt - 1), 4))
-                continue
-
-            response.raise_for_status()
-            result = response.json()
+            ) as response:
+                status = response.status
+                if stream and status == 200:
+                    return await _read_until_decided(response, stop_pattern)
+
+                # Keep the raw bytes; they are only decoded to text on failure
+                last_body = await response.read()
+
+                if status in OPENROUTER_RETRY_STATUSES and attempt < max_attempts:
+                    model_logger.warning(
+                        f"Retrying OpenRouter model {model_name} after HTTP {status} "
+                        f"(attempt {attempt}/{max_attempts})"
+                    )
+                    await asyncio.sleep(
+                        _retry_delay(attempt, response.headers.get("Retry-After"))
+                    )
+                    continue
+
+                response.raise_for_status()
+                result = orjson.loads(last_body)
             return result["choices"][0]["message"]["content"]
         except Exception as exc:
             last_error = exc
-            if response is not None:
-                last_response_text = response.text
 
-            should_retry = False
-            if response is not None and response.status_code in OPENROUTER_RETRY_STATUSES:
-                should_retry = attempt < max_attempts
-            elif isinstance(exc, requests.RequestException):
-                should_retry = attempt < max_attempts
+            if attempt >= max_attempts:
+                break
 
-            if should_retry:
-                time.sleep(min(2 ** (attempt - 1), 4))
+            if isinstance(exc, asyncio.TimeoutError):
+                # A latency spike: retry once, giving the model more time
+                if timed_out:
+                    break
+                timed_out = True
+                timeout = aiohttp.ClientTimeout(
+                    total=timeout.total * OPENROUTER_TIMEOUT_RETRY_FACTOR
+                )
+                model_logger.warning(
+                    f"Retrying OpenRouter model {model_name} after timeout "
+                    f"with a {timeout.total:.0f}s limit"
+                )
+                continue
+
+            # Connection-level failures are transient; HTTP errors that got
+            # here have a non-retryable status
+            if status is None and isinstance(exc, aiohttp.ClientError):
+                await asyncio.sleep(_retry_delay(attempt))
                 continue
 
+            break
+
+    last_response_text = (
+        last_body[:2000].decode("utf-8", "replace")
+        if last_body is not None
+        else "No response received"
+    )
     model_logger.log_model_issue(
         model_name,
         "openrouter_request_failed",
@@ -189,9 +427,27 @@ def get_openrouter_response(model_name, prompt):
     return "ERROR: Could not get response from OpenRouter"
 
 
+def get_openrouter_response(model_name, prompt, system_prompt=None, stop_pattern=None):
+    """
+    Get a response from an LLM model using OpenRouter API.
+
+    Args:
+        model_name (str): The name of the LLM model to use.
+        prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix sent ahead of the prompt.
+        stop_pattern (str, optional): See get_openrouter_response_async.
+
+    Returns:
+        str: The response from the model.
+    """
+    return _run_async(
+        get_openrouter_response_async(model_name, prompt, system_prompt, stop_pattern)
+    )
+
+
 def get_openrouter_key_info(api_key: str | None = None) -> dict[str, Any]:
     """Fetch metadata about the configured OpenRouter key."""
-    response = requests.get(
+    response = _http_session.get(
         f"{OPENROUTER_API_ROOT}/key",
         headers=_openrouter_headers(api_key),
         timeout=15,
@@ -203,7 +459,7 @@ def get_openrouter_key_info(api_key: str | None = None) -> dict[str, Any]:
 
 def get_openrouter_credits(api_key: str | None = None) -> dict[str, Any]:
     """Fetch aggregate OpenRouter credit and usage data."""
-    response = requests.get(
+    response = _http_session.get(
         f"{OPENROUTER_API_ROOT}/credits",
         headers=_openrouter_headers(api_key),
         timeout=15,
@@ -256,18 +512,176 @@ def get_openrouter_account_state(api_key: str | None = None) -> dict[str, Any]:
         }
 
 
-def get_llm_response(model_name, prompt):
+def _response_cache_key(model_name, prompt, system_prompt=None, stop_pattern=None):
+    # A response cut off at its decision line is only reused for requests
+    # that would stop at the same line, never as a full response
+    return hashlib.blake2b(
+        f"{model_name}|{system_prompt or ''}|{stop_pattern or ''}|{prompt}".encode(),
+        digest_size=16,
+    ).digest()
+
+
+def _get_response_store():
+    """Return the shared on-disk response store, opening it on first use."""
+    global _response_store
+    with _response_store_lock:
+        if _response_store is None:
+            from response_store import ResponseStore
+
+            _response_store = ResponseStore(
+                config.RESPONSE_STORE_PATH, ttl=config.RESPONSE_STORE_TTL
+            )
+        return _response_store
+
+
+def _get_semantic_cache():
+    """Return the shared semantic cache, creating it on first use."""
+    global _semantic_cache
+    with _semantic_cache_lock:
+        if _semantic_cache is None:
+            from semantic_cache import SemanticCache
+
+            _semantic_cache = SemanticCache()
+        return _semantic_cache
+
+
+def _cache_response(key, response):
+    """Remember a successful response, evicting the oldest entry when full."""
+    with _response_cache_lock:
+        if len(_response_cache) >= config.LLM_RESPONSE_CACHE_SIZE:
+            _response_cache.pop(next(iter(_response_cache)))
+        _response_cache[key] = response
+
+
+async def get_llm_response_async(
+    model_name, prompt, system_prompt=None, semantic_scope=None, stop_pattern=None
+):
     """
-    Get a response from an LLM model using the appropriate API (OpenRouter or Ollama).
+    Get a response from an LLM model using the appropriate API without blocking.
 
     Args:
         model_name (str): The name of the LLM model to use.
         prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix sent ahead of the prompt.
+        semantic_scope (hashable, optional): Lets the response be reused for
+            near-identical prompts in the same scope when SEMANTIC_CACHE is on.
+            Only pass it for calls where a fresh answer adds nothing.
+        stop_pattern (str, optional): Regex for the decision line the response
+            ends with; OpenRouter responses stop there when STOP_AT_DECISION is on.
 
     Returns:
         str: The response from the model.
     """
+    # Only OpenRouter responses are streamed and cut off at the decision line
+    truncated_at = (
+        stop_pattern
+        if config.STOP_AT_DECISION and not is_ollama_model(model_name)
+        else None
+    )
+
+    use_semantic_cache = config.SEMANTIC_CACHE and semantic_scope is not None
+    if use_semantic_cache:
+        semantic_cache = _get_semantic_cache()
+        semantic_scope = (model_name, truncated_at, semantic_scope)
+        # Embedding is CPU-bound; keep it off the event loop
+        cached = await asyncio.to_thread(semantic_cache.get, semantic_scope, prompt)
+        if cached is not None:
+            return cached
+
+    if config.CACHE_LLM_RESPONSES or config.RESPONSE_STORE_PATH:
+        key = _response_cache_key(model_name, prompt, system_prompt, truncated_at)
+    if config.CACHE_LLM_RESPONSES:
+        with _response_cache_lock:
+            cached = _response_cache.get(key)
+        if cached is not None:
+            return cached
+    if config.RESPONSE_STORE_PATH:
+        response_store = _get_response_store()
+        stored = await asyncio.to_thread(response_store.get, key)
+        if stored is not None:
+            return stored
+
     if is_ollama_model(model_name):
-        return get_ollama_response(model_name, prompt)
+        response = await asyncio.to_thread(
+            get_ollama_response, model_name, prompt, system_prompt
+        )
     else:
-        return get_openrouter_response(model_name, prompt)
+        response = await get_openrouter_response_async(
+            model_name, prompt, system_prompt, stop_pattern
+        )
+
+    if config.CACHE_LLM_RESPONSES and not response.startswith("ERROR:"):
+        _cache_response(key, response)
+    if config.RESPONSE_STORE_PATH and not response.startswith("ERROR:"):
+        await asyncio.to_thread(response_store.put, key, model_name, response)
+    if use_semantic_cache and not response.startswith("ERROR:"):
+        await asyncio.to_thread(semantic_cache.put, semantic_scope, prompt, response)
+    return response
+
+
+def get_llm_response(
+    model_name, prompt, system_prompt=None, semantic_scope=None, stop_pattern=None
+):
+    """
+    Get a response from an LLM model using the appropriate API (OpenRouter or Ollama).
+
+    Args:
+        model_name (str): The name of the LLM model to use.
+        prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix sent ahead of the prompt.
+        semantic_scope (hashable, optional): See get_llm_response_async.
+        stop_pattern (str, optional): See get_llm_response_async.
+
+    Returns:
+        str: The response from the model.
+    """
+    return _run_async(
+        get_llm_response_async(
+            model_name, prompt, system_prompt, semantic_scope, stop_pattern
+        )
+    )
+
+
+def submit_llm_response(
+    model_name, prompt, system_prompt=None, semantic_scope=None, stop_pattern=None
+):
+    """
+    Start getting a response from an LLM model without waiting for it.
+
+    Args:
+        model_name (str): The name of the LLM model to use.
+        prompt (str): The prompt to send to the model.
+        system_prompt (str, optional): Static prompt prefix sent ahead of the prompt.
+        semantic_scope (hashable, optional): See get_llm_response_async.
+        stop_pattern (str, optional): See get_llm_response_async.
+
+    Returns:
+        concurrent.futures.Future: Resolves to the response from the model.
+    """
+    return asyncio.run_coroutine_threadsafe(
+        get_llm_response_async(
+            model_name, prompt, system_prompt, semantic_scope, stop_pattern
+        ),
+        _get_event_loop(),
+    )
+
+
+def get_llm_responses(requests_to_send):
+    """
+    Get responses for several independent prompts concurrently.
+
+    Args:
+        requests_to_send (list): List of (model_name, prompt) tuples,
+            optionally followed by system_prompt, semantic_scope and
+            stop_pattern.
+
+    Returns:
+        list: The responses, in the same order as the requests.
+    """
+
+    async def gather_responses():
+        return await asyncio.gather(
+            *(get_llm_response_async(*request) for request in requests_to_send)
+        )
+
+    return _run_async(gather_responses())
@@ -10,6 +10,7 @@ from game_templates import (
     GAME_RULES,
     CONFIRMATION_VOTE_EXPLANATIONS,
     PROMPT_TEMPLATES,
+    PROMPT_SUFFIX_TEMPLATES,
     CONFIRMATION_VOTE_TEMPLATES,
     THINKING_TAGS,
     ACTION_PATTERNS,
@@ -17,6 +18,10 @@ from game_templates import (
     CONFIRMATION_VOTE_PATTERNS,
 )
 
+# Private <think> blocks, any case; an unclosed tag runs to the end of the text
+_THINK_RE = re.compile(r"<think>.*?</think>|<think>.*$", re.DOTALL | re.IGNORECASE)
+_BLANK_LINES_RE = re.compile(r"\n\s*\n")
+
 
 class Player:
     """Represents an LLM player in the Mafia game."""
@@ -37,6 +42,9 @@ class Player:
         self.alive = True
         self.protected = False  # Whether the player is protected by the doctor
         self.language = language if language else "English"
+        # Last static prompt prefix, reused until the roster it lists changes
+        self._static_prefix = None
+        self._static_prefix_key = None
 
     def __str__(self):
         """Return a string representation of the player."""
@@ -198,27 +206,78 @@ class Player:
         Returns:
             str: The prompt for the player.
         """
+        return "".join(
+            self.generate_prompt_parts(
+                game_state, all_players, mafia_members, discussion_history
+            )
+        )
+
+    def generate_prompt_parts(
+        self, game_state, all_players, mafia_members=None, discussion_history=None
+    ):
+        """
+        Generate a player's prompt split into a static prefix and a per-turn suffix.
+
+        The prefix (rules, role instructions and player roster) only changes
+        when a player dies, so sending it first lets providers reuse their
+        cached prefix across the player's calls.
+
+        Args:
+            game_state (dict): The current state of the game.
+            all_players (list): List of all players in the game.
+            mafia_members (list, optional): List of mafia members (only for Mafia role).
+            discussion_history (str, optional): History of previous discussions.
+                Note: This should only contain day phase messages, night messages are filtered out.
+
+        Returns:
+            tuple: (static_prefix, dynamic_suffix) strings.
+        """
         if discussion_history is None:
             discussion_history = ""
 
         # Get list of player names (using visible player names)
-        player_names = [p.player_name for p in all_players if p.alive]
+        player_names = tuple(p.player_name for p in all_players if p.alive)
+        mafia_names = ()
+        if self.role == Role.MAFIA:
+            mafia_names = tuple(
+                p.player_name for p in mafia_members if p != self and p.alive
+            )
 
-        # Make sure we're only using player_name (not model_name) for other players
-        # This ensures players only know each other by their player names
-        player_info = [{"name": p.player_name, "alive": p.alive} for p in all_players]
+        # The prefix only changes when a player dies
+        if self._static_prefix_key != (player_names, mafia_names):
+            self._static_prefix = self._build_static_prefix(player_names, mafia_names)
+            self._static_prefix_key = (player_names, mafia_names)
 
         # Get the appropriate language, defaulting to English if not supported
         language = self.language if self.language in GAME_RULES else "English"
 
+        dynamic_suffix = PROMPT_SUFFIX_TEMPLATES[language].format(
+            game_state=game_state,
+            discussion_history=discussion_history,
+        )
+
+        return self._static_prefix, dynamic_suffix
+
+    def _build_static_prefix(self, player_names, mafia_names):
+        """
+        Format the static prompt prefix for the current roster.
+
+        Args:
+            player_names (tuple): Visible names of the alive players.
+            mafia_names (tuple): Visible names of the other alive Mafia members
+                (empty for other roles).
+
+        Returns:
+            str: The rules, role instructions and roster part of the prompt.
+        """
+        # Get the appropriate language, defaulting to English if not supported
+        language = self.language if self.language in GAME_RULES else "English"
+
         # Get game rules for the player's language
         game_rules = GAME_RULES[language]
 
         if self.role == Role.MAFIA:
             # For Mafia members (using visible player names)
-            mafia_names = [
-                p.player_name for p in mafia_members if p != self and p.alive
-            ]
             mafia_list = f"{', '.join(mafia_names) if mafia_names else 'None (you are the only Mafia left)'}"
             if language == "Spanish":
                 mafia_list = f"{', '.join(mafia_names) if mafia_names else 'Ninguno (eres el único miembro de la Mafia que queda)'}"
@@ -227,57 +286,84 @@ class Player:
             elif language == "Korean":
                 mafia_list = f"{', '.join(mafia_names) if mafia_names else '없음 (당신이 유일하게 남은 마피아입니다)'}"
 
-            prompt = PROMPT_TEMPLATES[language][Role.MAFIA].format(
+            return PROMPT_TEMPLATES[language][Role.MAFIA].format(
                 model_name=self.player_name,  # Use player_name in prompts
                 game_rules=game_rules,
                 mafia_members=mafia_list,
                 player_names=", ".join(player_names),
-                game_state=game_state,
-                thinking_tag=THINKING_TAGS[language],
-                discussion_history=discussion_history,
-            )
-        elif self.role == Role.DOCTOR:
-            # For Doctor
-            prompt = PROMPT_TEMPLATES[language][Role.DOCTOR].format(
-                model_name=self.player_name,  # Use player_name in prompts
-                game_rules=game_rules,
-                player_names=", ".join(player_names),
-                game_state=game_state,
-                thinking_tag=THINKING_TAGS[language],
-                discussion_history=discussion_history,
-            )
-        else:  # Role.VILLAGER
-            # For Villagers
-            prompt = PROMPT_TEMPLATES[language][Role.VILLAGER].format(
-                model_name=self.player_name,  # Use player_name in prompts
-                game_rules=game_rules,
-                player_names=", ".join(player_names),
-                game_state=game_state,
                 thinking_tag=THINKING_TAGS[language],
-                discussion_history=discussion_history,
             )
 
-        return prompt
+        # Role.DOCTOR and Role.VILLAGER
+        return PROMPT_TEMPLATES[language][self.role].format(
+            model_name=self.player_name,  # Use player_name in prompts
+            game_rules=game_rules,
+            player_names=", ".join(player_names),
+            thinking_tag=THINKING_TAGS[language],
+        )
 
-    def get_response(self, prompt):
+    def decision_pattern(self, phase):
+        """
+        Get the pattern of the decision line this player ends a response with.
+
+        Args:
+            phase (str): "night" or "day_voting".
+
+        Returns:
+            str or None: The action or vote pattern, or None if the player
+                makes no decision in this phase.
+        """
+        if phase == "night":
+            return ACTION_PATTERNS.get(self.language, ACTION_PATTERNS["English"]).get(
+                self.role
+            )
+        if phase == "day_voting":
+            return VOTE_PATTERNS.get(self.language, VOTE_PATTERNS["English"])
+        return None
+
+    def get_response(self, prompt, system_prompt=None, stop_pattern=None):
         """
         Get a response from the LLM model using OpenRouter API.
 
         Args:
             prompt (str): The prompt to send to the model.
+            system_prompt (str, optional): Static prompt prefix, sent as a
+                cacheable system message ahead of the prompt.
+            stop_pattern (str, optional): Decision line the response ends
+                with, from decision_pattern().
 
         Returns:
             str: The response from the model with private thoughts removed.
         """
-        response = get_llm_response(self.model_name, prompt)
+        return self.process_response(
+            prompt,
+            get_llm_response(
+                self.model_name, prompt, system_prompt, stop_pattern=stop_pattern
+            ),
+            system_prompt,
+        )
+
+    def process_response(self, prompt, response, system_prompt=None):
+        """
+        Turn a raw model response into the message shared with other players.
+
+        Args:
+            prompt (str): The prompt that produced the response.
+            response (str): The raw response from the model.
+            system_prompt (str, optional): Static prompt prefix sent with the prompt.
+
+        Returns:
+            str: The response with private thoughts removed, or a fallback
+                response if the model call failed.
+        """
         if response.startswith("ERROR:"):
-            response = self._build_fallback_response(prompt)
+            response = self._build_fallback_response(f"{system_prompt or ''}{prompt}")
 
         # Remove any <think></think> tags and their contents before sharing with other players
-        cleaned_response = re.sub(r"<think>.*?</think>", "", response, flags=re.DOTALL)
+        cleaned_response = _THINK_RE.sub("", response)
 
         # Clean up any extra whitespace that might have been created
-        cleaned_response = re.sub(r"\n\s*\n", "\n\n", cleaned_response)
+        cleaned_response = _BLANK_LINES_RE.sub("\n\n", cleaned_response)
         cleaned_response = cleaned_response.strip()
 
         return cleaned_response
@@ -359,6 +445,19 @@ class Player:
         Returns:
             str: "agree" or "disagree" indicating the player's vote
         """
+        prompt = self.generate_confirmation_vote_prompt(game_state)
+        return self.parse_confirmation_vote(self.get_response(prompt))
+
+    def generate_confirmation_vote_prompt(self, game_state):
+        """
+        Generate the prompt asking the player to confirm an elimination.
+
+        Args:
+            game_state (dict): The current state of the game, including who is up for elimination.
+
+        Returns:
+            str: The confirmation vote prompt.
+        """
         player_to_eliminate = game_state["confirmation_vote_for"]
         game_state_str = game_state["game_state"]
 
@@ -383,8 +482,18 @@ class Player:
             thinking_tag=THINKING_TAGS[language],
         )
 
-        response = self.get_response(prompt)
+        return prompt
+
+    def parse_confirmation_vote(self, response):
+        """
+        Parse a confirmation vote from the player's response.
+
+        Args:
+            response (str): The response from the player (already cleaned of thinking tags).
 
+        Returns:
+            str: "agree" or "disagree" indicating the player's vote
+        """
         # Parse the response for agree/disagree based on language
         language = (
             self.language if self.language in CONFIRMATION_VOTE_PATTERNS else "English"
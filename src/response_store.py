@@ -0,0 +1,78 @@
+"""
+Persistent response store for the LLM Mafia Game Competition.
+
+Keeps LLM responses in a SQLite file so that replays and fixed-seed runs
+can reuse them across processes. See RESPONSE_STORE_PATH in config.
+"""
+
+import sqlite3
+import threading
+import time
+
+CREATE_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS cache (
+    key BLOB PRIMARY KEY,
+    model TEXT NOT NULL,
+    response TEXT NOT NULL,
+    created_at REAL NOT NULL
+)
+"""
+
+
+class ResponseStore:
+    """SQLite-backed map of request digest to response, shared by all threads."""
+
+    def __init__(self, path, ttl=0):
+        """
+        Open (creating if needed) the store.
+
+        Args:
+            path (str): Path of the SQLite database file.
+            ttl (float, optional): Seconds a response stays valid; 0 keeps it forever.
+        """
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # WAL lets other processes read while one of them writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(CREATE_TABLE_SQL)
+        self._conn.commit()
+
+    def get(self, key):
+        """
+        Look up a stored response.
+
+        Args:
+            key (bytes): Digest of the request.
+
+        Returns:
+            str or None: The response, or None if missing or expired.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        response, created_at = row
+        if self.ttl and time.time() - created_at >= self.ttl:
+            return None
+        return response
+
+    def put(self, key, model_name, response):
+        """
+        Store a response, replacing any earlier one for the same request.
+
+        Args:
+            key (bytes): Digest of the request.
+            model_name (str): The model that produced the response.
+            response (str): The response text.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, model, response, created_at) "
+                "VALUES (?, ?, ?, ?)",
+                (key, model_name, response, time.time()),
+            )
+            self._conn.commit()
@@ -0,0 +1,103 @@
+"""
+Semantic response cache for the LLM Mafia Game Competition.
+
+Reuses a previous response when a new prompt is nearly identical to one
+already answered, judged by the cosine similarity of sentence embeddings.
+Requires the optional faiss-cpu and sentence-transformers packages
+(``pip install .[semantic-cache]``); both are imported on first use.
+"""
+
+import threading
+
+import config
+
+# Scopes kept at once; the oldest is dropped first. Scopes are per game, so
+# a long simulation would otherwise keep an index for every finished game.
+MAX_SCOPES = 1024
+
+
+class SemanticCache:
+    """Nearest-neighbour cache of responses, partitioned by scope.
+
+    Lookups only compare prompts within one scope (for example one voter
+    deciding on one candidate), so a similar prompt about a different
+    decision can never return its answer.
+    """
+
+    def __init__(self, model_name=None, threshold=None, max_entries=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            model_name (str, optional): sentence-transformers model used for embeddings.
+            threshold (float, optional): Minimum cosine similarity for a hit.
+            max_entries (int, optional): Maximum cached prompts per scope.
+        """
+        self.model_name = model_name or config.SEMANTIC_CACHE_MODEL
+        self.threshold = (
+            threshold if threshold is not None else config.SEMANTIC_CACHE_THRESHOLD
+        )
+        self.max_entries = max_entries or config.SEMANTIC_CACHE_SIZE
+        self._encoder = None
+        # scope -> (faiss index, cached responses in index order)
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def _encode(self, text):
+        """Return the normalized embedding of a text as a (1, dim) array."""
+        if self._encoder is None:
+            from sentence_transformers import SentenceTransformer
+
+            self._encoder = SentenceTransformer(self.model_name)
+        return self._encoder.encode(
+            [text], normalize_embeddings=True, convert_to_numpy=True
+        ).astype("float32")
+
+    def get(self, scope, prompt):
+        """
+        Look up a response for a prompt.
+
+        Args:
+            scope (hashable): Partition to search, e.g. (model, voter, candidate).
+            prompt (str): The prompt about to be sent.
+
+        Returns:
+            str or None: The cached response, or None on a miss.
+        """
+        with self._lock:
+            if scope not in self._entries:
+                return None
+        embedding = self._encode(prompt)
+        with self._lock:
+            if scope not in self._entries:
+                return None
+            index, responses = self._entries[scope]
+            similarities, positions = index.search(embedding, 1)
+        if positions[0][0] >= 0 and similarities[0][0] >= self.threshold:
+            return responses[positions[0][0]]
+        return None
+
+    def put(self, scope, prompt, response):
+        """
+        Remember the response to a prompt.
+
+        Args:
+            scope (hashable): Partition to store the prompt in.
+            prompt (str): The prompt that was sent.
+            response (str): The model's response.
+        """
+        embedding = self._encode(prompt)
+        with self._lock:
+            if scope not in self._entries:
+                import faiss
+
+                if len(self._entries) >= MAX_SCOPES:
+                    del self._entries[next(iter(self._entries))]
+                self._entries[scope] = (faiss.IndexFlatIP(embedding.shape[1]), [])
+            index, responses = self._entries[scope]
+            if len(responses) >= self.max_entries:
+                # A flat index cannot drop single rows; start the scope over
+                index.reset()
+                responses.clear()
+            index.add(embedding)
+            responses.append(response)
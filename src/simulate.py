@@ -2,18 +2,233 @@
 Simulation script for the LLM Mafia Game Competition.
 """
 
+import os
 import time
 import random
+import queue
+import threading
 import concurrent.futures
-from collections import defaultdict
 import argparse
+import orjson
 import config
 from game import MafiaGame
 from firebase_manager import FirebaseManager
 from logger import GameLogger, Color
 
+# Finished games are written in batches of up to this many games...
+DB_WRITE_BATCH_SIZE = 40
+# ...or after this many seconds, whichever comes first
+DB_WRITE_FLUSH_INTERVAL = 2.0
+
+# Finished games kept for reuse by run_single_game; at most one per worker
+_game_pool = queue.LifoQueue(maxsize=config.MAX_WORKERS)
+
+# Adaptive concurrency re-evaluates its limit after this many games...
+ADAPTIVE_WINDOW = 10
+# ...and halves it when mean game time grows by more than this factor
+ADAPTIVE_SLOWDOWN = 1.5
+
+
+class GameResultWriter:
+    """Persist finished games on a background thread in batched transactions."""
+
+    _STOP = object()
+
+    def __init__(
+        self,
+        firebase,
+        batch_size=DB_WRITE_BATCH_SIZE,
+        flush_interval=DB_WRITE_FLUSH_INTERVAL,
+        logger=None,
+    ):
+        self.firebase = firebase
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.logger = logger
+        # Games that could not be written to the database
+        self.dropped = 0
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self._run, daemon=True)
+        self.thread.start()
+
+    def put(self, game):
+        """Queue a finished game for storage."""
+        self.queue.put(game)
+
+    def close(self):
+        """Write any queued games and stop the background thread."""
+        self.queue.put(self._STOP)
+        self.thread.join()
+
+    def _run(self):
+        batch = []
+        deadline = None
+        while True:
+            timeout = max(0, deadline - time.monotonic()) if batch else None
+            try:
+                item = self.queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None  # Flush interval elapsed
+
+            if item is self._STOP:
+                self._flush(batch)
+                return
+
+            if item is not None:
+                if not batch:
+                    deadline = time.monotonic() + self.flush_interval
+                batch.append(item)
+
+            if batch and (item is None or len(batch) >= self.batch_size):
+                self._flush(batch)
+                batch = []
+
+    def _flush(self, batch):
+        if not batch:
+            return
+        # Never let an error escape: it would kill the writer thread and
+        # leave every later game queued forever
+        try:
+            for game in batch:
+                # Critic reviews may still be in flight when a game is queued
+                if isinstance(game["critic_review"], concurrent.futures.Future):
+                    try:
+                        game["critic_review"] = game["critic_review"].result()
+                    except Exception as e:
+                        self._report(f"Critic review for game {game['game_id']} failed: {e}")
+                        game["critic_review"] = None
+            stored = self.firebase.store_games_batch(batch)
+        except Exception as e:
+            self._report(f"Error writing games to the database: {e}")
+            stored = 0
+
+        if stored < len(batch):
+            self.dropped += len(batch) - stored
+            self._report(
+                f"Dropped {len(batch) - stored} of {len(batch)} game(s) while "
+                f"writing to the database ({self.dropped} dropped so far)"
+            )
+
+    def _report(self, message):
+        if self.logger is not None:
+            self.logger.error(message)
+        else:
+            print(message)
+
+
+class ConcurrencyLimit:
+    """Cap the number of games in flight, optionally adapting the cap.
+
+    The limit grows additively while mean game latency over each window of
+    completed games stays steady, and is halved when latency degrades (for
+    example when the API starts rate limiting). With ``minimum == maximum``
+    it is a plain fixed-size gate.
+    """
+
+    def __init__(self, minimum, maximum, window=ADAPTIVE_WINDOW, on_change=None):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = minimum
+        self.window = window
+        self.on_change = on_change
+        self.in_flight = 0
+        self._latencies = []
+        self._baseline = None
+        self._condition = threading.Condition()
+
+    def acquire(self):
+        """Block until another game may start."""
+        with self._condition:
+            self._condition.wait_for(lambda: self.in_flight < self.limit)
+            self.in_flight += 1
+
+    def release(self, latency):
+        """Record a finished game and let the next one start."""
+        with self._condition:
+            self.in_flight -= 1
+            if self.minimum < self.maximum:
+                self._latencies.append(latency)
+                if len(self._latencies) >= self.window:
+                    self._adjust()
+            self._condition.notify_all()
+
+    def _adjust(self):
+        mean_latency = sum(self._latencies) / len(self._latencies)
+        self._latencies = []
+        old_limit = self.limit
+
+        if self._baseline is not None and mean_latency > self._baseline * ADAPTIVE_SLOWDOWN:
+            self.limit = max(self.minimum, self.limit // 2)
+            self._baseline = None  # Re-measure at the lower limit
+        else:
+            self.limit = min(self.maximum, self.limit + self.minimum)
+            if self._baseline is None:
+                self._baseline = mean_latency
+
+        if self.limit != old_limit and self.on_change is not None:
+            self.on_change(old_limit, self.limit, mean_latency)
+
+
+# Role -> (stats key prefix, team that wins with that role).
+# Unknown roles are counted as villagers.
+_ROLE_WIN = {
+    "Mafia": ("mafia", "Mafia"),
+    "Doctor": ("doctor", "Villagers"),
+    "Villager": ("villager", "Villagers"),
+}
+
+
+def new_model_stats():
+    """Return zeroed per-model counters."""
+    return {
+        "games": 0,
+        "wins": 0,
+        "mafia_games": 0,
+        "mafia_wins": 0,
+        "villager_games": 0,
+        "villager_wins": 0,
+        "doctor_games": 0,
+        "doctor_wins": 0,
+    }
 
-def run_single_game(game_number, language=None, models=None):
+
+def update_stats(stats, winner, participants):
+    """
+    Fold one finished game into the simulation statistics.
+
+    Args:
+        stats (dict): The statistics dictionary built by run_simulation.
+        winner (str): The winning team ("Mafia" or "Villagers").
+        participants (dict): Participants keyed by player name.
+    """
+    stats["completed_games"] += 1
+    if winner == "Mafia":
+        stats["mafia_wins"] += 1
+    else:
+        stats["villager_wins"] += 1
+
+    for player_name, role_data in participants.items():
+        # Handle both old and new format
+        if isinstance(role_data, dict):
+            role = role_data.get("role")
+            model = role_data.get("model_name", player_name)  # Use player_name as fallback
+        else:
+            # Legacy format where role_data is just the role string
+            role = role_data
+            model = player_name  # In legacy format, the key was the model name
+
+        prefix, winning_team = _ROLE_WIN.get(role, _ROLE_WIN["Villager"])
+        model_stats = stats["model_stats"].get(model)
+        if model_stats is None:
+            model_stats = stats["model_stats"][model] = new_model_stats()
+        model_stats["games"] += 1
+        model_stats[f"{prefix}_games"] += 1
+        if winner == winning_team:
+            model_stats[f"{prefix}_wins"] += 1
+            model_stats["wins"] += 1
+
+
+def run_single_game(game_number, language=None, models=None, defer_critic_review=False):
     """
     Run a single Mafia game.
 
@@ -21,18 +236,42 @@ def run_single_game(game_number, language=None, models=None):
         game_number (int): The game number.
         language (str, optional): Language for game prompts and interactions. Defaults to config.LANGUAGE.
         models (list, optional): List of model names to use as players. Defaults to config.MODELS.
+        defer_critic_review (bool, optional): Return critic_review as a
+            concurrent.futures.Future that resolves after the game returns.
 
     Returns:
-        tuple: (game_number, winner, rounds_data, participants, game_id, language, critic_review)
+        tuple: (game_number, winner, rounds_json, participants, game_id, language, critic_review)
+            where rounds_json is the game transcript already encoded as a JSON array.
     """
-    game = MafiaGame(models=models, language=language)
-    winner, rounds_data, participants, language, critic_review = game.run_game()
+    try:
+        game = _game_pool.get_nowait()
+        game.reset(models=models, language=language)
+    except queue.Empty:
+        game = MafiaGame(models=models, language=language)
+
+    try:
+        winner, rounds_data, participants, language, critic_review = game.run_game(
+            defer_critic_review=defer_critic_review
+        )
+        game_id = game.game_id
+        # The transcript is only needed again for storage. Encoded JSON is far
+        # smaller than the dict graph while it waits in the writer queue.
+        rounds_json = orjson.dumps(rounds_data).decode()
+    finally:
+        # Drop the transcript so pooled games do not keep it alive. Once
+        # pooled, another thread may reset the game at any moment.
+        game.reset()
+        try:
+            _game_pool.put_nowait(game)
+        except queue.Full:
+            pass
+
     return (
         game_number,
         winner,
-        rounds_data,
+        rounds_json,
         participants,
-        game.game_id,
+        game_id,
         language,
         critic_review,
     )
@@ -41,10 +280,11 @@ def run_single_game(game_number, language=None, models=None):
 def run_simulation(
     num_games=config.NUM_GAMES,
     parallel=False,
-    max_workers=4,
+    max_workers=config.MAX_WORKERS,
     language=None,
     models=None,
     status_callback=None,
+    adaptive_workers=config.ADAPTIVE_WORKERS,
 ):
     """
     Run multiple Mafia games and store results.
@@ -59,16 +299,20 @@ def run_simulation(
     Args:
         status_callback (callable, optional): Receives progress updates as
             ``status_callback(message, level="info")``.
+        adaptive_workers (bool, optional): In parallel mode, start at the CPU
+            count and scale towards max_workers based on observed game latency.
 
     Returns:
         dict: Statistics about the games.
     """
+    config.validate_role_counts()
+
     def emit_status(message, level="info"):
         if status_callback is not None:
             status_callback(message, level=level)
 
     # Initialize logger
-    logger = GameLogger()
+    logger = GameLogger(name="mafia.sim")
     logger.header(f"STARTING SIMULATION WITH {num_games} GAMES", Color.BRIGHT_MAGENTA)
     emit_status(f"Starting simulation with {num_games} game(s).")
 
@@ -76,6 +320,7 @@ def run_simulation(
 
     # Initialize database
     firebase = FirebaseManager()
+    writer = GameResultWriter(firebase, logger=logger) if firebase.initialized else None
 
     # Initialize statistics
     stats = {
@@ -83,201 +328,140 @@ def run_simulation(
         "completed_games": 0,
         "mafia_wins": 0,
         "villager_wins": 0,
-        "model_stats": defaultdict(
-            lambda: {
-                "games": 0,
-                "wins": 0,
-                "mafia_games": 0,
-                "mafia_wins": 0,
-                "villager_games": 0,
-                "villager_wins": 0,
-                "doctor_games": 0,
-                "doctor_wins": 0,
-            }
-        ),
+        # Filled in by update_stats as models actually play
+        "model_stats": {},
     }
 
     # Use the provided language or default from config
     game_language = language if language is not None else config.LANGUAGE
 
-    if parallel and num_games > 1:
-        # Run games in parallel
-        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            # Submit all games
-            future_to_game = {
-                executor.submit(run_single_game, i, game_language, models): i
-                for i in range(1, num_games + 1)
-            }
-
-            # Process results as they complete
-            for future in concurrent.futures.as_completed(future_to_game):
-                game_number = future_to_game[future]
-                try:
-                    (
-                        game_number,
-                        winner,
-                        rounds_data,
-                        participants,
-                        game_id,
-                        language,
-                        critic_review,
-                    ) = future.result()
-
-                    # Store results in database
-                    if firebase.initialized:
-                        firebase.store_game_result(
-                            game_id, winner, participants, language=language
-                        )
-                        firebase.store_game_log(
-                            game_id,
-                            rounds_data,
-                            participants,
-                            language=language,
-                            critic_review=critic_review,
-                        )
-
-                    # Update statistics
-                    stats["completed_games"] += 1
-                    if winner == "Mafia":
-                        stats["mafia_wins"] += 1
-                    else:
-                        stats["villager_wins"] += 1
-
-                    # Update model statistics
-                    for player_name, role_data in participants.items():
-                        # Handle both old and new format
-                        if isinstance(role_data, dict):
-                            role = role_data.get("role")
-                            model = role_data.get(
-                                "model_name", player_name
-                            )  # Use player_name as fallback
-                        else:
-                            # Legacy format where role_data is just the role string
-                            role = role_data
-                            model = player_name  # In legacy format, the key was the model name
-
-                        stats["model_stats"][model]["games"] += 1
-
-                        if role == "Mafia":
-                            stats["model_stats"][model]["mafia_games"] += 1
-                            if winner == "Mafia":
-                                stats["model_stats"][model]["mafia_wins"] += 1
-                                stats["model_stats"][model]["wins"] += 1
-                        elif role == "Doctor":
-                            stats["model_stats"][model]["doctor_games"] += 1
-                            if winner == "Villagers":
-                                stats["model_stats"][model]["doctor_wins"] += 1
-                                stats["model_stats"][model]["wins"] += 1
-                        else:  # Villager
-                            stats["model_stats"][model]["villager_games"] += 1
-                            if winner == "Villagers":
-                                stats["model_stats"][model]["villager_wins"] += 1
-                                stats["model_stats"][model]["wins"] += 1
-
-                    # Log game completion
-                    win_color = Color.RED if winner == "Mafia" else Color.GREEN
-                    logger.print(
-                        f"Game {game_number} completed. Winner: {winner}",
-                        win_color,
-                        bold=True,
-                    )
-                    emit_status(
-                        f"Game {game_number} completed. Winner: {winner}.",
-                        level="success",
-                    )
-
-                except Exception as e:
-                    logger.error(f"Game {game_number} generated an exception: {e}")
-                    emit_status(
-                        f"Game {game_number} generated an exception: {e}",
-                        level="error",
-                    )
+    def record_game(result):
+        """Queue a finished game for storage and fold it into the statistics."""
+        (
+            game_number,
+            winner,
+            rounds_json,
+            participants,
+            game_id,
+            language,
+            critic_review,
+        ) = result
+
+        # Queue results for the database writer
+        if writer is not None:
+            writer.put(
+                {
+                    "game_id": game_id,
+                    "winner": winner,
+                    "participants": participants,
+                    "rounds": rounds_json,
+                    "language": language,
+                    "critic_review": critic_review,
+                }
+            )
+
+        update_stats(stats, winner, participants)
+
+        # Log game completion
+        win_color = Color.RED if winner == "Mafia" else Color.GREEN
+        logger.print(
+            f"Game {game_number} completed. Winner: {winner}",
+            win_color,
+            bold=True,
+        )
+        emit_status(
+            f"Game {game_number} completed. Winner: {winner}.",
+            level="success",
+        )
+
+    def report_failure(game_number, error):
+        logger.error(f"Game {game_number} generated an exception: {error}")
+        emit_status(
+            f"Game {game_number} generated an exception: {error}",
+            level="error",
+        )
+
+    # Games are I/O-bound: nearly all their time is spent waiting on LLM
+    # APIs, and the GIL is released during socket reads. Threads therefore
+    # scale well here, while a ProcessPoolExecutor would add a Python
+    # interpreter (tens of MB) per worker and pickling of every result for
+    # no gain. Sequential runs use the same path with a single worker, so
+    # games still run one after another, in order.
+    # At least one worker: ThreadPoolExecutor rejects zero, even for num_games=0
+    workers = max(1, min(num_games, max_workers)) if parallel else 1
+
+    def log_limit_change(old_limit, new_limit, mean_latency):
+        logger.print(
+            f"Adjusting parallel games from {old_limit} to {new_limit} "
+            f"(mean game time {mean_latency:.1f}s)",
+            Color.CYAN,
+        )
+
+    if adaptive_workers and workers > 1:
+        limit = ConcurrencyLimit(
+            min(os.cpu_count() or 4, workers), workers, on_change=log_limit_change
+        )
     else:
-        # Run games sequentially
-        for i in range(1, num_games + 1):
-            game_number = i  # Define game_number at the start of each iteration
+        limit = ConcurrencyLimit(workers, workers)
+
+    def run_limited_game(game_number):
+        started = time.monotonic()
+        try:
+            # The writer waits for each critic review, so the worker can
+            # start its next game while the critic model answers
+            return run_single_game(
+                game_number,
+                game_language,
+                models,
+                defer_critic_review=writer is not None,
+            )
+        finally:
+            limit.release(time.monotonic() - started)
+
+    # Workers hand finished games to a single aggregator thread, which
+    # owns the statistics and feeds the database writer
+    results_queue = queue.Queue()
+
+    def on_done(future, game_number):
+        # Unwrap here so nothing keeps a reference to the finished future
+        try:
+            results_queue.put((game_number, future.result(), None))
+        except Exception as e:
+            results_queue.put((game_number, None, e))
+
+    def aggregate():
+        while (item := results_queue.get()) is not None:
+            game_number, result, error = item
             try:
-                (
-                    game_number,
-                    winner,
-                    rounds_data,
-                    participants,
-                    game_id,
-                    language,
-                    critic_review,
-                ) = run_single_game(i, game_language, models)
-
-                # Store results in database
-                if firebase.initialized:
-                    firebase.store_game_result(
-                        game_id, winner, participants, language=language
-                    )
-                    firebase.store_game_log(
-                        game_id,
-                        rounds_data,
-                        participants,
-                        language=language,
-                        critic_review=critic_review,
-                    )
-
-                # Update statistics
-                stats["completed_games"] += 1
-                if winner == "Mafia":
-                    stats["mafia_wins"] += 1
-                else:
-                    stats["villager_wins"] += 1
-
-                # Update model statistics
-                for player_name, role_data in participants.items():
-                    # Handle both old and new format
-                    if isinstance(role_data, dict):
-                        role = role_data.get("role")
-                        model = role_data.get(
-                            "model_name", player_name
-                        )  # Use player_name as fallback
-                    else:
-                        # Legacy format where role_data is just the role string
-                        role = role_data
-                        model = (
-                            player_name  # In legacy format, the key was the model name
-                        )
-
-                    stats["model_stats"][model]["games"] += 1
-
-                    if role == "Mafia":
-                        stats["model_stats"][model]["mafia_games"] += 1
-                        if winner == "Mafia":
-                            stats["model_stats"][model]["mafia_wins"] += 1
-                            stats["model_stats"][model]["wins"] += 1
-                    elif role == "Doctor":
-                        stats["model_stats"][model]["doctor_games"] += 1
-                        if winner == "Villagers":
-                            stats["model_stats"][model]["doctor_wins"] += 1
-                            stats["model_stats"][model]["wins"] += 1
-                    else:  # Villager
-                        stats["model_stats"][model]["villager_games"] += 1
-                        if winner == "Villagers":
-                            stats["model_stats"][model]["villager_wins"] += 1
-                            stats["model_stats"][model]["wins"] += 1
-
-                # Log game completion
-                win_color = Color.RED if winner == "Mafia" else Color.GREEN
-                logger.print(
-                    f"Game {game_number} completed. Winner: {winner}",
-                    win_color,
-                    bold=True,
-                )
-                emit_status(
-                    f"Game {game_number} completed. Winner: {winner}.",
-                    level="success",
-                )
-
+                if error is not None:
+                    raise error
+                record_game(result)
             except Exception as e:
-                logger.error(f"Game {game_number} generated an exception: {e}")
-                emit_status(
-                    f"Game {game_number} generated an exception: {e}",
-                    level="error",
-                )
+                report_failure(game_number, e)
+
+    aggregator = threading.Thread(target=aggregate, daemon=True)
+    aggregator.start()
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=workers) as executor:
+        # Submit games as the concurrency limit allows
+        for i in range(1, num_games + 1):
+            limit.acquire()
+            executor.submit(run_limited_game, i).add_done_callback(
+                lambda future, game_number=i: on_done(future, game_number)
+            )
+
+    # Every game has finished; let the aggregator drain and stop
+    results_queue.put(None)
+    aggregator.join()
+
+    # Wait for queued games to reach the database
+    if writer is not None:
+        writer.close()
+        if writer.dropped:
+            emit_status(
+                f"{writer.dropped} game(s) could not be saved to the database.",
+                level="error",
+            )
 
     # Calculate elapsed time
     elapsed_time = time.time() - start_time
@@ -322,8 +506,14 @@ if __name__ == "__main__":
     parser.add_argument(
         "--max-workers",
         type=int,
-        default=4,
-        help="Maximum number of worker threads for parallel execution (default: 4)"
+        default=config.MAX_WORKERS,
+        help=f"Maximum number of worker threads for parallel execution (default: {config.MAX_WORKERS})"
+    )
+    parser.add_argument(
+        "--adaptive-workers",
+        action="store_true",
+        default=config.ADAPTIVE_WORKERS,
+        help="Scale parallel games between the CPU count and --max-workers based on game latency"
     )
     
     args = parser.parse_args()
@@ -346,7 +536,7 @@ if __name__ == "__main__":
         models = None
     
     # Log which models are being used
-    logger = GameLogger()
+    logger = GameLogger(name="mafia.sim")
     if args.free_models:
         logger.print(f"Using free OpenRouter models only: {len(config.FREE_MODELS)} models available", Color.CYAN, bold=True)
     elif args.ollama:
@@ -359,5 +549,6 @@ if __name__ == "__main__":
         num_games=args.num_games,
         parallel=args.parallel,
         max_workers=args.max_workers,
-        models=models
+        models=models,
+        adaptive_workers=args.adaptive_workers,
     )
@@ -1,7 +1,7 @@
 import sys
 import unittest
 from pathlib import Path
-from unittest.mock import patch
+from unittest.mock import MagicMock, patch
 
 sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
 
@@ -34,24 +34,210 @@ class FirebaseManagerTests(unittest.TestCase):
 
         self.assertFalse(result)
 
-    def test_get_model_stats_supports_legacy_and_object_participants(self):
+    def test_store_games_batch_skips_invalid_game(self):
+        manager = self.make_manager()
+        manager.initialized = True
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+
+        with patch.object(manager, "_connection") as mock_connection:
+            mock_connection.return_value.__enter__.return_value = connection
+            stored = manager.store_games_batch(
+                [
+                    {
+                        "game_id": "game-1",
+                        "winner": "Villagers",
+                        "participants": {"Alice": {"model_name": "openai/gpt-5.4", "role": "Villager"}},
+                        "rounds": [],
+                    },
+                    {
+                        "game_id": "game-2",
+                        "winner": "Mafia",
+                        "participants": ["bad-payload"],
+                        "rounds": [],
+                    },
+                ]
+            )
+
+        self.assertEqual(stored, 1)
+        result_call, log_call = cursor.executemany.call_args_list
+        self.assertEqual([row[0] for row in result_call.args[1]], ["game-1"])
+        self.assertEqual([row[0] for row in log_call.args[1]], ["game-1"])
+
+    def test_store_games_batch_retries_games_one_by_one(self):
+        manager = self.make_manager()
+        manager.initialized = True
+        games = [
+            {
+                "game_id": f"game-{number}",
+                "winner": "Villagers",
+                "participants": {"Alice": {"model_name": "openai/gpt-5.4", "role": "Villager"}},
+                "rounds": [],
+            }
+            for number in (1, 2)
+        ]
+
+        with (
+            patch.object(manager, "_connection", side_effect=firebase_manager_module.psycopg.Error("boom")),
+            patch.object(manager, "store_game_result", side_effect=[True, False]) as store_result,
+            patch.object(manager, "store_game_log", return_value=True) as store_log,
+        ):
+            stored = manager.store_games_batch(games)
+
+        self.assertEqual(stored, 1)
+        self.assertEqual(store_result.call_count, 2)
+        store_log.assert_called_once()
+
+    def test_game_log_row_passes_through_encoded_rounds(self):
+        manager = self.make_manager()
+        participants = {"Alice": {"model_name": "openai/gpt-5.4", "role": "Villager"}}
+
+        row = manager._game_log_row(
+            "game-1", '[{"round_number": 1}]', participants, "Classic Mafia", "English", None
+        )
+
+        self.assertEqual(row[5], '[{"round_number": 1}]')
+        with self.assertRaises(TypeError):
+            manager._game_log_row(
+                "game-1", '{"round_number": 1}', participants, "Classic Mafia", "English", None
+            )
+
+    def test_get_model_stats_reads_materialized_totals(self):
+        manager = self.make_manager()
+        manager.initialized = True
+        fake_rows = [
+            {
+                "model_name": "openai/gpt-5.4",
+                "games_played": 2,
+                "games_won": 1,
+                "mafia_games": 0,
+                "mafia_wins": 0,
+                "villager_games": 1,
+                "villager_wins": 1,
+                "doctor_games": 1,
+                "doctor_wins": 0,
+            },
+            {
+                "model_name": "anthropic/claude-sonnet-4.6",
+                "games_played": 2,
+                "games_won": 1,
+                "mafia_games": 2,
+                "mafia_wins": 1,
+                "villager_games": 0,
+                "villager_wins": 0,
+                "doctor_games": 0,
+                "doctor_wins": 0,
+            },
+        ]
+        connection = MagicMock()
+        connection.cursor.return_value.__enter__.return_value.fetchall.return_value = fake_rows
+
+        with patch.object(manager, "_connection") as mock_connection:
+            mock_connection.return_value.__enter__.return_value = connection
+            stats = manager.get_model_stats()
+
+        self.assertEqual(stats["openai/gpt-5.4"]["games_played"], 2)
+        self.assertEqual(stats["openai/gpt-5.4"]["games_won"], 1)
+        self.assertEqual(stats["openai/gpt-5.4"]["villager_win_rate"], 1.0)
+        self.assertEqual(stats["openai/gpt-5.4"]["doctor_win_rate"], 0.0)
+        self.assertEqual(stats["anthropic/claude-sonnet-4.6"]["mafia_wins"], 1)
+        self.assertAlmostEqual(stats["anthropic/claude-sonnet-4.6"]["win_rate"], 0.5)
+        self.assertNotIn("model_name", stats["openai/gpt-5.4"])
+        self.assertEqual(stats["openai/gpt-5.4"]["short_name"], "gpt-5.4")
+
+    def test_get_game_results_limits_in_sql_and_decodes_participants(self):
+        manager = self.make_manager()
+        manager.initialized = True
+        connection = MagicMock()
+        cursor = connection.cursor.return_value.__enter__.return_value
+        cursor.fetchmany.side_effect = [
+            [{"game_id": "game-2", "participants": '{"Alice": {"role": "Mafia"}}'}],
+            [],
+        ]
+
+        with patch.object(manager, "_connection") as mock_connection:
+            mock_connection.return_value.__enter__.return_value = connection
+            results = manager.get_game_results(limit=1)
+
+        sql, params = cursor.execute.call_args.args
+        # Legacy millisecond rows must not sort above every current game
+        self.assertIn(
+            f"ORDER BY {firebase_manager_module.TIMESTAMP_SECONDS_SQL} DESC, game_id DESC", sql
+        )
+        self.assertIn("LIMIT %s", sql)
+        self.assertEqual(params, (1,))
+        self.assertEqual(results, [{"game_id": "game-2", "participants": {"Alice": {"role": "Mafia"}}}])
+
+    def executed_schema_sql(self, model_stats_missing):
+        manager = self.make_manager()
+        cursor = MagicMock()
+        cursor.fetchone.return_value = {"missing": model_stats_missing}
+
+        manager._ensure_model_stats_schema(cursor)
+
+        return [" ".join(call.args[0].split()) for call in cursor.execute.call_args_list]
+
+    def test_model_stats_schema_reads_legacy_and_object_participants(self):
+        statements = self.executed_schema_sql(model_stats_missing=False)
+
+        roles_function = next(
+            sql for sql in statements
+            if "FUNCTION mafia_game_participant_roles" in sql
+        )
+        # Object participants name their model; legacy ones are keyed by
+        # model name with the role string as the value
+        self.assertIn("COALESCE(p.value->>'model_name', p.key) ELSE p.key END", roles_function)
+        self.assertIn("THEN p.value->>'role' ELSE p.value #>> '{}' END", roles_function)
+        self.assertIn("FROM jsonb_each(p_participants)", roles_function)
+
+        apply_function = next(
+            sql for sql in statements if "FUNCTION apply_model_stats" in sql
+        )
+        self.assertIn("FROM mafia_game_participant_roles(p_participants)", apply_function)
+        self.assertIn("r.role IN ('Villager', 'Doctor') AND p_winner = 'Villagers'", apply_function)
+
+    def test_model_stats_trigger_reverses_old_rows(self):
+        statements = self.executed_schema_sql(model_stats_missing=False)
+
+        trigger_function = next(
+            sql for sql in statements if "FUNCTION update_model_stats()" in sql
+        )
+        self.assertIn("PERFORM apply_model_stats(OLD.participants, OLD.winner, -1);", trigger_function)
+        self.assertIn("PERFORM apply_model_stats(NEW.participants, NEW.winner, 1);", trigger_function)
+        self.assertTrue(
+            any(
+                "AFTER INSERT OR UPDATE OR DELETE ON mafia_games" in sql
+                and "EXECUTE FUNCTION update_model_stats()" in sql
+                for sql in statements
+            )
+        )
+
+    def test_model_stats_backfilled_only_when_table_is_new(self):
+        backfill = "SELECT apply_model_stats(participants, winner, 1) FROM mafia_games;"
+
+        new_table_statements = self.executed_schema_sql(model_stats_missing=True)
+        existing_table_statements = self.executed_schema_sql(model_stats_missing=False)
+
+        # The backfill runs after the trigger exists so no game is missed
+        self.assertEqual(new_table_statements[-1], backfill)
+        self.assertNotIn(backfill, existing_table_statements)
+
+    def test_get_model_analytics_supports_legacy_participants(self):
         manager = self.make_manager()
         manager.initialized = True
         fake_results = [
             {
+                "game_id": "game-1",
+                "timestamp": 100,
                 "winner": "Villagers",
                 "participants": {
-                    "Alice": {
-                        "model_name": "openai/gpt-5.4",
-                        "role": "Villager",
-                    },
-                    "Bob": {
-                        "model_name": "anthropic/claude-sonnet-4.6",
-                        "role": "Mafia",
-                    },
+                    "Alice": {"model_name": "openai/gpt-5.4", "role": "Villager"},
+                    "Bob": {"model_name": "anthropic/claude-sonnet-4.6", "role": "Mafia"},
                 },
             },
             {
+                "game_id": "game-2",
+                "timestamp": 200,
                 "winner": "Mafia",
                 "participants": {
                     "openai/gpt-5.4": "Doctor",
@@ -60,15 +246,12 @@ class FirebaseManagerTests(unittest.TestCase):
             },
         ]
 
-        with patch.object(manager, "get_game_results", return_value=fake_results):
-            stats = manager.get_model_stats()
+        with patch.object(manager, "iter_game_results", return_value=iter(fake_results)):
+            analytics = manager.get_model_analytics("openai/gpt-5.4")
 
-        self.assertEqual(stats["openai/gpt-5.4"]["games_played"], 2)
-        self.assertEqual(stats["openai/gpt-5.4"]["games_won"], 1)
-        self.assertEqual(stats["openai/gpt-5.4"]["villager_games"], 1)
-        self.assertEqual(stats["openai/gpt-5.4"]["doctor_games"], 1)
-        self.assertEqual(stats["anthropic/claude-sonnet-4.6"]["mafia_wins"], 1)
-        self.assertAlmostEqual(stats["anthropic/claude-sonnet-4.6"]["win_rate"], 0.5)
+        self.assertEqual(analytics["games_played"], 2)
+        self.assertEqual(analytics["games_won"], 1)
+        self.assertEqual(analytics["lost_most_against"][0]["model_name"], "anthropic/claude-sonnet-4.6")
 
     def test_get_model_analytics_returns_timeline_and_matchups(self):
         manager = self.make_manager()
@@ -126,7 +309,7 @@ class FirebaseManagerTests(unittest.TestCase):
             },
         ]
 
-        with patch.object(manager, "get_game_results", return_value=fake_results):
+        with patch.object(manager, "iter_game_results", return_value=iter(fake_results)):
             analytics = manager.get_model_analytics("openai/gpt-5.4")
 
         self.assertIsNotNone(analytics)
@@ -0,0 +1,131 @@
+import os
+import queue
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import game as game_module
+import simulate
+from game import MafiaGame
+
+
+class MafiaGameTests(unittest.TestCase):
+    def setUp(self):
+        # Game log files are written under ./logs
+        log_root = tempfile.TemporaryDirectory()
+        self.addCleanup(log_root.cleanup)
+        self.addCleanup(os.chdir, os.getcwd())
+        os.chdir(log_root.name)
+
+    def test_reset_game_logs_to_new_file(self):
+        game = MafiaGame()
+        first_log = game.logger.log_path
+        first_game_id = game.game_id
+
+        game.reset()
+
+        self.assertNotEqual(game.logger.log_path, first_log)
+        self.assertIn(first_game_id, first_log)
+        self.assertIn(game.game_id, game.logger.log_path)
+
+    def test_pooled_game_writes_one_log_file_per_game_played(self):
+        def fake_run_game(game, defer_critic_review=False):
+            game.logger.event("Game over")
+            return "Villagers", [], {}, game.language, None
+
+        with (
+            patch.object(MafiaGame, "run_game", autospec=True, side_effect=fake_run_game),
+            patch.object(simulate, "_game_pool", queue.LifoQueue(maxsize=1)),
+        ):
+            played = [simulate.run_single_game(number)[4] for number in (1, 2)]
+
+        # The second game reuses the pooled instance; resets that are never
+        # played leave no empty files behind
+        log_files = os.listdir("logs")
+        self.assertEqual(len(log_files), 2)
+        for game_id in played:
+            self.assertEqual(sum(game_id in name for name in log_files), 1)
+
+    def test_semantic_cache_scopes_are_per_game(self):
+        scopes = []
+
+        def fake_responses(requests):
+            scopes.extend(request[3] for request in requests)
+            return ["agree"] * len(requests)
+
+        games = [MafiaGame(), MafiaGame()]
+        with (
+            patch.object(game_module.random, "sample", side_effect=lambda items, k: list(items)[:k]),
+            patch.object(game_module.config, "BATCH_CONFIRMATION", False),
+            patch.object(game_module, "get_llm_responses", side_effect=fake_responses),
+        ):
+            for game in games:
+                game.models = ["model-a", "model-b", "model-c", "model-d", "model-e", "model-f"]
+                game.unique_models = False
+                self.assertTrue(game.setup_game())
+                game.get_confirmation_vote(game.players[0])
+
+        first_game_scopes, second_game_scopes = scopes[: len(scopes) // 2], scopes[len(scopes) // 2 :]
+        # Both games seat the same names, so only the game ID tells them apart
+        self.assertEqual(
+            [scope[2:] for scope in first_game_scopes], [scope[2:] for scope in second_game_scopes]
+        )
+        self.assertTrue(all(scope[1] == games[0].game_id for scope in first_game_scopes))
+        self.assertTrue(all(scope[1] == games[1].game_id for scope in second_game_scopes))
+        self.assertFalse(set(first_game_scopes) & set(second_game_scopes))
+
+    def test_batched_confirmation_votes_come_from_each_voters_model(self):
+        game = MafiaGame(language="English")
+        game.models = ["model-a", "model-b"]
+        game.unique_models = False
+        # Seat the two models alternately
+        with patch.object(
+            game_module.random,
+            "choices",
+            side_effect=lambda items, k: [items[i % len(items)] for i in range(k)],
+        ):
+            self.assertTrue(game.setup_game())
+        target, *voters = game.players
+        requested_models = []
+
+        def fake_responses(requests):
+            requested_models.extend(model for model, _ in requests)
+            # Each model tries to vote for every player in the game
+            return [
+                game_module.orjson.dumps(
+                    {player.player_name: model for player in game.players}
+                ).decode()
+                for model, _ in requests
+            ]
+
+        with patch.object(game_module, "get_llm_responses", side_effect=fake_responses):
+            votes = game._get_batched_confirmation_votes(target, voters, "state")
+
+        self.assertEqual(sorted(requested_models), ["model-a", "model-b"])
+        self.assertEqual(votes, [voter.model_name for voter in voters])
+
+    def test_batched_confirmation_votes_skip_non_english_games(self):
+        game = MafiaGame(language="Korean")
+        game.models = ["model-a"]
+        game.unique_models = False
+        self.assertTrue(game.setup_game())
+        target, *voters = game.players
+
+        with patch.object(game_module, "get_llm_responses") as get_responses:
+            votes = game._get_batched_confirmation_votes(target, voters, "state")
+
+        self.assertIsNone(votes)
+        get_responses.assert_not_called()
+
+    def test_invalid_role_counts_rejected_when_game_starts(self):
+        with patch.object(game_module.config, "VILLAGER_COUNT", 0):
+            with self.assertRaises(ValueError):
+                MafiaGame()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,51 @@
+import logging
+import os
+import queue
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "src"))
+
+import logger as logger_module
+from logger import GameLogger
+
+
+class GameLoggerTests(unittest.TestCase):
+    def test_log_file_created_on_first_write(self):
+        # Module-level loggers, such as openrouter's, must not leave files
+        # behind in whatever directory imports them
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        game_logger = GameLogger(log_dir=log_dir.name, name="mafia.test_files")
+
+        self.assertEqual(os.listdir(log_dir.name), [])
+
+        game_logger.print("Game over")
+
+        self.assertEqual(os.listdir(log_dir.name), [os.path.basename(game_logger.log_path)])
+
+    def test_log_level_only_filters_console_output(self):
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        game_logger = GameLogger(log_dir=log_dir.name, name="mafia.test_levels")
+        game_logger.logger.setLevel(logging.WARNING)
+        self.addCleanup(game_logger.logger.setLevel, logging.NOTSET)
+        file_lines = queue.SimpleQueue()
+
+        with (
+            patch.object(logger_module, "_file_queue", file_lines),
+            patch.object(game_logger.logger, "log") as console_log,
+        ):
+            game_logger.print("Alice votes for Bob")
+
+        console_log.assert_not_called()
+        log_file, text = file_lines.get_nowait()
+        self.assertEqual(text, "Alice votes for Bob\n")
+        log_file.close()
+
+
+if __name__ == "__main__":
+    unittest.main()